@@ -7,8 +7,13 @@ X-Proxy-Auth shared secret and Cloudflare Turnstile server-side verification.
 """
 
 import os
+import atexit
 import logging
+import logging.handlers
+import queue
 import asyncio
+import contextlib
+import functools
 
 from pathlib import Path
 from dotenv import load_dotenv
@@ -17,12 +22,12 @@ load_dotenv(Path(__file__).resolve().parent / ".env")  # no-op when absent (Clou
 from google.adk.runners import Runner  # noqa: E402
 from google.adk.plugins.logging_plugin import LoggingPlugin  # noqa: E402
 from google.genai import types  # noqa: E402
-from typing import Optional  # noqa: E402
+from typing import Annotated, Any, Mapping, Optional, Sequence  # noqa: E402
 import hmac  # noqa: E402
 
 import httpx  # noqa: E402
 from fastapi import FastAPI, Request, HTTPException  # noqa: E402
-from pydantic import BaseModel  # noqa: E402
+from pydantic import BaseModel, StringConstraints  # noqa: E402
 
 try:
     from .utils import places_agent_core
@@ -31,32 +36,38 @@ except ImportError:
     from utils import places_agent_core
     from utils import topic_preferences
 
-try:
-    from google.genai import errors as genai_errors
-except ImportError:  # pragma: no cover
-    genai_errors = None
-
 # Load environment variables
 
-# Configure logging for cloud environment
+# Configure logging for cloud environment. Request coroutines only enqueue
+# records; a listener thread does the actual stream writes, so a slow log
+# pipe never stalls the event loop.
+# The QueueHandler formats each record before enqueueing it, so the stream
+# handler behind the listener writes the finished line as-is.
+_LOG_QUEUE: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_LOG_LISTENER = logging.handlers.QueueListener(
+    _LOG_QUEUE, logging.StreamHandler(), respect_handler_level=True
+)
 logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.handlers.QueueHandler(_LOG_QUEUE)],
 )
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
 logger = logging.getLogger(__name__)
 
 # Constants
 
 
-def _is_transient_model_error(exc: BaseException) -> bool:
-    return places_agent_core.is_transient_model_error(exc)
-
+# Plain aliases rather than forwarding wrappers: no extra frame per check.
+_is_transient_model_error = places_agent_core.is_transient_model_error
+_is_quota_exhausted_error = places_agent_core.is_quota_exhausted_error
 
-def _is_quota_exhausted_error(exc: BaseException) -> bool:
-    return places_agent_core.is_quota_exhausted_error(exc)
 
-
-def _get_model_candidates() -> list[str]:
-    return places_agent_core.get_model_candidates()
+@functools.lru_cache(maxsize=1)
+def _get_model_candidates() -> tuple[str, ...]:
+    # Model env vars are fixed for the life of the process; resolve them once.
+    return tuple(places_agent_core.get_model_candidates())
 
 
 async def _run_runner_collect_final_text(
@@ -70,7 +81,10 @@ async def _run_runner_collect_final_text(
 ) -> str:
     def _on_retry(attempt: int, total_attempts: int, delay: float) -> None:
         logger.warning(
-            f"Model temporarily unavailable (503). Retrying in {delay:.1f}s... ({attempt}/{total_attempts})"
+            "Model temporarily unavailable (503). Retrying in %.1fs... (%d/%d)",
+            delay,
+            attempt,
+            total_attempts,
         )
 
     return await places_agent_core.run_runner_collect_final_text(
@@ -82,23 +96,28 @@ async def _run_runner_collect_final_text(
         initial_delay_s=initial_delay_s,
         backoff_factor=backoff_factor,
         on_retry=_on_retry,
+        final_author=places_agent_core.FINAL_AGENT_NAME,
     )
 
 
 _DEV_DUMMY_KEY = "test-api-key-returns-dummy-response"
 
 
-def _configure_genai_auth() -> None:
-    api_key = os.environ.get("GOOGLE_API_KEY", "")
+def _configure_genai_auth() -> str:
+    environ = os.environ
+    api_key = environ.get("GOOGLE_API_KEY", "")
     if not api_key:
         raise RuntimeError("GOOGLE_API_KEY is not set — cannot authenticate to Gemini")
+    environ["GOOGLE_GENAI_USE_VERTEXAI"] = "FALSE"
     if api_key == _DEV_DUMMY_KEY:
         logger.info("Dummy API key detected — LLM calls will return stub responses")
-    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "FALSE"
+        return "dummy"
     logger.info("Gemini authentication configured (API key)")
+    return "api_key"
 
 
-_configure_genai_auth()
+# Auth mode resolved once at import: "api_key" or "dummy".
+_AUTH_MODE = _configure_genai_auth()
 
 
 # ============================================================================
@@ -116,23 +135,28 @@ def initialize_multi_agent_system(model_name: Optional[str] = None):
     return root_agent
 
 
+_PROMPT_TMPL = (
+    "City: {city}\n"
+    "Preferences: {preferences}\n\n"
+    "Goal: recommend 5 specific, currently-operating places in this city "
+    "that fit the preferences above. Return the final answer as a polished "
+    "Markdown guide following the FormatterAgent contract."
+)
+_PROMPT_WITH_HINTS_TMPL = (
+    _PROMPT_TMPL + "\n\n"
+    "Taste hints (optional) — preference phrases from earlier searches "
+    "on this Topic. Use them only where they reinforce or refine the "
+    "current Preferences.\n\n{past_preferences}"
+)
+
+
 def _build_search_prompt(city: str, preferences: str, past_preferences: str) -> str:
     """Build the LLM prompt, injecting past preferences as taste context when available."""
-    base = (
-        f"City: {city}\n"
-        f"Preferences: {preferences}\n\n"
-        "Goal: recommend 5 specific, currently-operating places in this city "
-        "that fit the preferences above. Return the final answer as a polished "
-        "Markdown guide following the FormatterAgent contract."
-    )
     if past_preferences:
-        return (
-            f"{base}\n\n"
-            "Taste hints (optional) — preference phrases from earlier searches "
-            "on this Topic. Use them only where they reinforce or refine the "
-            f"current Preferences.\n\n{past_preferences}"
+        return _PROMPT_WITH_HINTS_TMPL.format(
+            city=city, preferences=preferences, past_preferences=past_preferences
         )
-    return base
+    return _PROMPT_TMPL.format(city=city, preferences=preferences)
 
 
 def create_app(root_agent, plugins=None):
@@ -147,11 +171,88 @@ def create_app(root_agent, plugins=None):
     return agent_app
 
 
+# The agent tree and App hold no per-request state, so one pair is built per
+# model on first use and shared by every later request. Construction is fully
+# synchronous, so concurrent coroutines cannot interleave a double build.
+_AGENT_CACHE: dict[str, tuple[Any, Any]] = {}
+
+
+class _QueuedLoggingPlugin(LoggingPlugin):
+    """LoggingPlugin that writes through logging instead of print().
+
+    The stock plugin prints ANSI-coloured lines to stdout from every agent,
+    model and tool callback, which blocks the event loop on each write. Routed
+    through a logger, the lines go via the QueueListener above and can be
+    silenced by level like any other logger.
+
+    Every callback writes through the private ``LoggingPlugin._log``, which
+    exists in google-adk 1.31 through 2.x; requirements.txt caps ADK below 3
+    and TestLoggingPlugin fails if a release stops routing through it.
+    """
+
+    def _log(self, message: str) -> None:
+        _adk_trace_logger.info("%s", message)
+
+
+_adk_trace_logger = logging.getLogger(f"{__name__}.adk")
+try:
+    _adk_trace_logger.setLevel(os.environ.get("ADK_TRACE_LOG_LEVEL", "INFO").upper())
+except ValueError:
+    logger.warning(
+        "Ignoring invalid ADK_TRACE_LOG_LEVEL=%r", os.environ["ADK_TRACE_LOG_LEVEL"]
+    )
+
+# The plugin keeps no per-run state, so every model's App shares one.
+_LOGGING_PLUGIN = _QueuedLoggingPlugin()
+
+
+def _app_plugins() -> list:
+    # The plugin formats its messages eagerly in every callback, so when its
+    # logger would drop them anyway, leave it out of the App altogether.
+    if _adk_trace_logger.isEnabledFor(logging.INFO):
+        return [_LOGGING_PLUGIN]
+    return []
+
+
+def _get_agent_app(model_name: str) -> tuple[Any, Any]:
+    """Return the cached ``(root_agent, App)`` pair for *model_name*."""
+    cached = _AGENT_CACHE.get(model_name)
+    if cached is None:
+        agent = initialize_multi_agent_system(model_name=model_name)
+        cached = (agent, create_app(agent, plugins=_app_plugins()))
+        _AGENT_CACHE[model_name] = cached
+    return cached
+
+
+# One Runner per (App, services) combination is reused; the services are
+# process-wide singletons and Runner.run_async is safe to call concurrently
+# with distinct session IDs.
+_RUNNER_CACHE: dict[tuple[int, int, int], Runner] = {}
+
+
+def _get_runner(model_name: str, session_service, memory_service) -> Runner:
+    """Return the cached Runner for *model_name* bound to the given services."""
+    _agent, agent_app = _get_agent_app(model_name)
+    key = (id(agent_app), id(session_service), id(memory_service))
+    runner = _RUNNER_CACHE.get(key)
+    if runner is None:
+        runner = Runner(
+            app=agent_app,
+            session_service=session_service,
+            memory_service=memory_service,
+        )
+        _RUNNER_CACHE[key] = runner
+    return runner
+
+
 # Sanitize strings before logging to prevent log injection
+_LOG_TRANSLATE = str.maketrans("", "", "\r\n")
+
+
 def _sanitize_log_str(s):
     if s is None:
         return ""
-    return str(s).replace("\r", "").replace("\n", "")
+    return str(s).translate(_LOG_TRANSLATE)
 
 
 def _build_dummy_llm_response(
@@ -177,76 +278,192 @@ def _build_dummy_llm_response(
     )
 
 
+def _read_hedge_delay_s() -> Optional[float]:
+    """Return ``GEMINI_HEDGE_DELAY_S`` as seconds, or None when hedging is off."""
+    raw = os.environ.get("GEMINI_HEDGE_DELAY_S", "").strip()
+    if not raw:
+        return None
+    try:
+        delay = float(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid GEMINI_HEDGE_DELAY_S=%r", raw)
+        return None
+    return delay if delay > 0 else None
+
+
+# When set, fallback models start speculatively after idx * delay seconds
+# even if the primary has not failed yet; otherwise they only start after the
+# previous model fails transiently. Off by default because every hedge runs a
+# full extra pipeline (Gemini tokens + google_search calls).
+_HEDGE_DELAY_S = _read_hedge_delay_s()
+
+
+# User-facing texts returned in place of results when every model failed
+# transiently. /search flags them as degraded so clients don't cache them.
+_QUOTA_EXCEEDED_MESSAGE = (
+    "Gemini API quota is exceeded (HTTP 429 RESOURCE_EXHAUSTED). "
+    "Try setting GEMINI_MODEL/GEMINI_FALLBACK_MODEL to a model that has available quota."
+)
+_MODEL_OVERLOADED_MESSAGE = (
+    "The AI model is temporarily overloaded (HTTP 503). "
+    "Please try again later, or configure GEMINI_MODEL / GEMINI_FALLBACK_MODEL."
+)
+_DEGRADED_RESULTS = frozenset({_QUOTA_EXCEEDED_MESSAGE, _MODEL_OVERLOADED_MESSAGE, ""})
+
+
+async def _run_model_attempt(
+    model_name: str,
+    user_id: str,
+    query_content: types.Content,
+    start_signal: Optional[asyncio.Event],
+    hedge_after_s: Optional[float],
+) -> str:
+    """Run the pipeline on *model_name* in its own transient session.
+
+    Fallback attempts first wait for *start_signal* (set when the previous
+    model fails transiently) or, when hedging, for *hedge_after_s* seconds.
+    """
+    if start_signal is not None:
+        try:
+            await asyncio.wait_for(start_signal.wait(), timeout=hedge_after_s)
+            logger.info(
+                "Switching model to '%s' and retrying", _sanitize_log_str(model_name)
+            )
+        except TimeoutError:
+            # Mark this attempt as started, so a later failure wakes the next
+            # candidate that is still waiting rather than this one.
+            start_signal.set()
+            logger.info(
+                "Primary model is slow; hedging with '%s'",
+                _sanitize_log_str(model_name),
+            )
+
+    session_service, memory_service = places_agent_core.initialize_services()
+    app_name = "PlacesSearchApp"
+    # No session ID is passed, so the helper creates a fresh one directly.
+    session, _created = await places_agent_core.create_or_retrieve_session(
+        session_service, app_name=app_name, user_id=user_id
+    )
+    try:
+        runner = _get_runner(model_name, session_service, memory_service)
+        return await _run_runner_collect_final_text(
+            runner=runner,
+            user_id=user_id,
+            session_id=session.id,
+            query_content=query_content,
+            max_attempts=3,
+            initial_delay_s=2.0,
+            backoff_factor=2.0,
+        )
+    finally:
+        # The session service outlives the request, so drop the transient
+        # session explicitly to keep the in-memory store bounded.
+        await session_service.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session.id
+        )
+
+
 async def _invoke_llm_pipeline(
     prompt: str,
     user_id: str,
-    model_candidates: list[str],
+    model_candidates: tuple[str, ...],
 ) -> str:
     """Run the real multi-agent Gemini pipeline against *prompt*.
 
     Centralised so the dev-stub short-circuit in `search_places` replaces only
     this call, leaving the surrounding DB read/write flow intact for local
     testing without real API credits.
-    """
-    session_service, memory_service = places_agent_core.initialize_services()
-    session_id = places_agent_core.generate_session_id()
-
-    app_name = "PlacesSearchApp"
-    session, _created_new = await places_agent_core.create_or_retrieve_session(
-        session_service=session_service,
-        app_name=app_name,
-        user_id=user_id,
-        session_id=session_id,
-    )
 
+    Each model candidate runs as its own task; the first successful result
+    wins and the remaining attempts are cancelled.
+    """
     query_content = types.Content(role="user", parts=[types.Part(text=prompt)])
 
-    final_text = ""
-    last_error: Optional[BaseException] = None
-    for idx, model_name in enumerate(model_candidates, start=1):
-        try:
-            if idx > 1:
-                safe_model_name = _sanitize_log_str(model_name)
-                logger.info(f"Switching model to '{safe_model_name}' and retrying")
-
-            agent = initialize_multi_agent_system(model_name=model_name)
-            agent_app = create_app(agent, plugins=[LoggingPlugin()])
-            runner = Runner(
-                app=agent_app,
-                session_service=session_service,
-                memory_service=memory_service,
-            )
-
-            final_text = await _run_runner_collect_final_text(
-                runner=runner,
+    signals: list[Optional[asyncio.Event]] = [None] + [
+        asyncio.Event() for _ in model_candidates[1:]
+    ]
+    pending = {
+        asyncio.create_task(
+            _run_model_attempt(
+                model_name=model_name,
                 user_id=user_id,
-                session_id=session.id,
                 query_content=query_content,
-                max_attempts=3,
-                initial_delay_s=2.0,
-                backoff_factor=2.0,
+                start_signal=signals[idx],
+                hedge_after_s=idx * _HEDGE_DELAY_S if _HEDGE_DELAY_S else None,
+            )
+        )
+        for idx, model_name in enumerate(model_candidates)
+    }
+
+    final_text = ""
+    last_error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
             )
-            last_error = None
-            break
-        except Exception as e:
-            last_error = e
-            if not _is_transient_model_error(e):
-                raise
-            continue
+            # A success and a failure can finish together; the success wins
+            # regardless of set iteration order.
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            for task in done:
+                exc = task.exception()
+                if not _is_transient_model_error(exc):
+                    raise exc
+                last_error = exc
+                next_signal = next(
+                    (sig for sig in signals if sig is not None and not sig.is_set()),
+                    None,
+                )
+                if next_signal is not None:
+                    next_signal.set()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
     if last_error is not None:
-        logger.exception("LLM request failed after retries/model fallback")
+        logger.error(
+            "LLM request failed after retries/model fallback", exc_info=last_error
+        )
         if _is_quota_exhausted_error(last_error):
-            return (
-                "Gemini API quota is exceeded (HTTP 429 RESOURCE_EXHAUSTED). "
-                "Try setting GEMINI_MODEL/GEMINI_FALLBACK_MODEL to a model that has available quota."
+            return _QUOTA_EXCEEDED_MESSAGE
+        return _MODEL_OVERLOADED_MESSAGE
+
+    return final_text
+
+
+# Identical prompts that arrive while one is already running share its result
+# instead of starting a second pipeline. Keyed by the full prompt, which
+# already includes any topic taste hints.
+_INFLIGHT: dict[str, "asyncio.Task[str]"] = {}
+
+
+async def _invoke_llm_pipeline_coalesced(
+    prompt: str,
+    user_id: str,
+    model_candidates: tuple[str, ...],
+) -> str:
+    """Run `_invoke_llm_pipeline`, joining an identical in-flight run if any."""
+    task = _INFLIGHT.get(prompt)
+    if task is None:
+        task = asyncio.create_task(
+            _invoke_llm_pipeline(
+                prompt=prompt,
+                user_id=user_id,
+                model_candidates=model_candidates,
             )
-        return (
-            "The AI model is temporarily overloaded (HTTP 503). "
-            "Please try again later, or configure GEMINI_MODEL / GEMINI_FALLBACK_MODEL."
         )
+        _INFLIGHT[prompt] = task
 
-    return final_text
+        def _forget(done: "asyncio.Task[str]") -> None:
+            if _INFLIGHT.get(prompt) is done:
+                del _INFLIGHT[prompt]
+
+        task.add_done_callback(_forget)
+    # Shielded so one disconnecting caller does not cancel the run for others.
+    return await asyncio.shield(task)
 
 
 async def search_places(
@@ -267,16 +484,24 @@ async def search_places(
          On DB failure, log the error; the user still gets their results.
 
     When `topic` is None, the database is never touched.
+
+    Raises ValueError for a blank city or preferences, so direct callers such
+    as `search_places_batch` fail fast instead of running the pipeline on
+    nothing.
     """
+    if not city_name or city_name.isspace() or not preferences or preferences.isspace():
+        raise ValueError("city_name and preferences must be non-empty")
     if topic:
         topic = topic.strip().lower()
 
-    city_name_clean = _sanitize_log_str(city_name)
-    preferences_clean = _sanitize_log_str(preferences)
     topic_clean = _sanitize_log_str(topic) if topic is not None else "transient"
-    logger.info(
-        f"Searching in {city_name_clean} for '{preferences_clean}' (topic: {topic_clean})"
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Searching in %s for '%s' (topic: %s)",
+            _sanitize_log_str(city_name),
+            _sanitize_log_str(preferences),
+            topic_clean,
+        )
 
     # 1) Retrieve persisted preferences for this topic (empty when anonymous/new/DB-down)
     past_preferences = ""
@@ -285,8 +510,9 @@ async def search_places(
             past_preferences = await topic_preferences.get_preferences(topic)
         except Exception:
             logger.exception(
-                f"Failed to load past preferences for topic '{topic_clean}'; "
-                "continuing with empty context"
+                "Failed to load past preferences for topic '%s'; "
+                "continuing with empty context",
+                topic_clean,
             )
 
     # 2) Build prompt — past preferences are injected as taste context when available
@@ -294,17 +520,18 @@ async def search_places(
 
     # 3) LLM call — mocked when the dev dummy key is set, so the DB flow is still exercised
     model_candidates = _get_model_candidates()
-    if os.environ.get("GOOGLE_API_KEY") == _DEV_DUMMY_KEY:
+    if _AUTH_MODE == "dummy":
         await asyncio.sleep(0.1)
         final_text = _build_dummy_llm_response(city_name, preferences, past_preferences)
     else:
-        final_text = await _invoke_llm_pipeline(
+        final_text = await _invoke_llm_pipeline_coalesced(
             prompt=prompt,
             user_id=user_id,
             model_candidates=model_candidates,
         )
 
-    # 4) Persist new preference bullet for this topic
+    # 4) Persist new preference bullet for this topic. Awaited, so the next
+    # search on the same topic is guaranteed to see it.
     if topic and final_text:
         try:
             await topic_preferences.append_and_maybe_summarize(
@@ -313,11 +540,41 @@ async def search_places(
                 model_name=model_candidates[0],
             )
         except Exception:
-            logger.exception(f"Failed to persist preferences for topic '{topic_clean}'")
+            logger.exception(
+                "Failed to persist preferences for topic '%s'", topic_clean
+            )
 
     return final_text
 
 
+async def search_places_batch(
+    queries: Sequence[Mapping[str, Any]],
+    max_concurrency: int = 4,
+) -> list[str]:
+    """Run several searches concurrently and return their results in order.
+
+    Each item in *queries* holds the keyword arguments for one
+    `search_places` call. At most *max_concurrency* searches run at a time,
+    to stay within Gemini's rate limits; each one still uses its own
+    transient session.
+
+    If any search fails, the others are cancelled rather than left running
+    unawaited, and the first failure is raised as-is.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(query: Mapping[str, Any]) -> str:
+        async with semaphore:
+            return await search_places(**query)
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_one(q)) for q in queries]
+    except ExceptionGroup as failures:
+        raise failures.exceptions[0]
+    return [task.result() for task in tasks]
+
+
 # ============================================================================
 # FastAPI Application (Cloud Run entry point)
 # ============================================================================
@@ -326,14 +583,50 @@ _PROXY_AUTH_TOKEN = os.environ.get("PROXY_AUTH_TOKEN", "")
 _TURNSTILE_SECRET_KEY = os.environ.get("TURNSTILE_SECRET_KEY", "")
 _TURNSTILE_VERIFY_URL = "https://challenges.cloudflare.com/turnstile/v0/siteverify"
 
-app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+@contextlib.asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Build the primary model's agent tree, App and Runner before the first
+    # request arrives, so cold-start construction is not on its timeline.
+    if _AUTH_MODE != "dummy":
+        try:
+            _get_runner(
+                _get_model_candidates()[0], *places_agent_core.initialize_services()
+            )
+        except Exception:
+            logger.exception("Runner warm-up failed; it will be built on demand")
+    yield
+
+
+app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None, lifespan=_lifespan)
+
+
+# Input bounds, checked before Turnstile verification or any model call so
+# blank or oversized requests are rejected with a 422 up front.
+MAX_CITY_LENGTH = 100
+MAX_PREFERENCES_LENGTH = 500
+MAX_TOPIC_LENGTH = 100
 
 
 class SearchRequest(BaseModel):
-    city: str
-    preferences: str
-    topic: Optional[str] = None
-    turnstile_token: str
+    city: Annotated[
+        str,
+        StringConstraints(
+            strip_whitespace=True, min_length=1, max_length=MAX_CITY_LENGTH
+        ),
+    ]
+    preferences: Annotated[
+        str,
+        StringConstraints(
+            strip_whitespace=True, min_length=1, max_length=MAX_PREFERENCES_LENGTH
+        ),
+    ]
+    topic: Optional[
+        Annotated[
+            str, StringConstraints(strip_whitespace=True, max_length=MAX_TOPIC_LENGTH)
+        ]
+    ] = None
+    turnstile_token: Annotated[str, StringConstraints(min_length=1, max_length=2048)]
 
 
 def _verify_proxy_auth(request: Request) -> None:
@@ -382,4 +675,4 @@ async def search_endpoint(request: Request, body: SearchRequest) -> dict:
         preferences=body.preferences,
         topic=body.topic,
     )
-    return {"result": result}
+    return {"result": result, "degraded": result in _DEGRADED_RESULTS}
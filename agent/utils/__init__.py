@@ -5,9 +5,22 @@ Contains shared tools and functions used across the application
 
 from importlib import import_module
 
-from .scoring_tools import calculate_distance_score, get_place_category_boost
+from .scoring_tools import (
+    calculate_distance_score,
+    calculate_distance_scores_batch,
+    compute_final_scores,
+    get_place_category_boost,
+    get_place_category_boosts_batch,
+)
 
-__all__ = ["calculate_distance_score", "get_place_category_boost", "places_agent_core"]
+__all__ = [
+    "calculate_distance_score",
+    "calculate_distance_scores_batch",
+    "compute_final_scores",
+    "get_place_category_boost",
+    "get_place_category_boosts_batch",
+    "places_agent_core",
+]
 
 
 def __getattr__(name: str):
@@ -1,49 +1,98 @@
 import os
+import re
 import uuid
+import random
 import asyncio
+import contextlib
+import functools
 from typing import Any, Callable, Dict, Optional, Tuple
 
 from google.adk.agents import LlmAgent, SequentialAgent
 from google.adk.apps.app import App, EventsCompactionConfig
-from google.adk.code_executors import BuiltInCodeExecutor
+from google.adk.errors.already_exists_error import AlreadyExistsError
 from google.adk.memory import InMemoryMemoryService
 from google.adk.models.google_llm import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from google.adk.tools import AgentTool, FunctionTool, google_search
+from google.adk.tools import FunctionTool, google_search
+from google.genai import errors as genai_errors
 from google.genai import types
 
-from .scoring_tools import calculate_distance_score, get_place_category_boost
+from .scoring_tools import (
+    calculate_distance_scores_batch,
+    compute_final_scores,
+    get_place_category_boosts_batch,
+)
 
-try:
-    from google.genai import errors as genai_errors
-except ImportError:  # pragma: no cover
-    genai_errors = None
+# Stateless with respect to the model, so built once and shared by every
+# pipeline instead of re-introspecting the function signatures per build.
+_DISTANCE_TOOL = FunctionTool(func=calculate_distance_scores_batch)
+_CATEGORY_TOOL = FunctionTool(func=get_place_category_boosts_batch)
+_FINAL_SCORE_TOOL = FunctionTool(func=compute_final_scores)
+
+_RETRY_CONFIG = types.HttpRetryOptions(
+    attempts=5,
+    exp_base=7,
+    initial_delay=1,
+    http_status_codes=[500, 503, 504],
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _gemini(model_name: str) -> Gemini:
+    """Return the shared Gemini model for *model_name*.
+
+    Every agent on the same model uses one instance, and with it one API
+    client and connection pool.
+    """
+    return Gemini(model=model_name, retry_options=_RETRY_CONFIG)
+
+
+# Error-message classifiers. Lookaheads anchored at the start keep the
+# keyword checks order-independent ("503 ... UNAVAILABLE" or "UNAVAILABLE ...
+# 503"), and one case-insensitive search replaces lower() plus several scans.
+_QUOTA_PATTERN = r"(?=.*429)(?=.*(?:resource_exhausted|quota))"
+_QUOTA_RE = re.compile(r"\A" + _QUOTA_PATTERN, re.IGNORECASE | re.DOTALL)
+_TRANSIENT_RE = re.compile(
+    r"\A(?:(?=.*503)(?=.*(?:overloaded|unavailable))"
+    r"|(?=.*the model is overloaded)"
+    r"|" + _QUOTA_PATTERN + ")",
+    re.IGNORECASE | re.DOTALL,
+)
 
 
 def is_transient_model_error(exc: BaseException) -> bool:
-    if genai_errors is not None and isinstance(
-        exc, getattr(genai_errors, "ServerError", ())
-    ):
-        status_code = getattr(exc, "status_code", None)
-        if status_code == 503:
-            return True
-
-    msg = str(exc).lower()
-    if "503" in msg and ("overloaded" in msg or "unavailable" in msg):
+    if isinstance(exc, genai_errors.ServerError) and exc.code == 503:
         return True
-    if "the model is overloaded" in msg:
-        return True
-    if "429" in msg and ("resource_exhausted" in msg or "quota" in msg):
-        return True
-    return False
+
+    return _TRANSIENT_RE.search(str(exc)) is not None
 
 
 def is_quota_exhausted_error(exc: BaseException) -> bool:
-    msg = str(exc).lower()
-    if "429" in msg and ("resource_exhausted" in msg or "quota" in msg):
-        return True
-    return False
+    return _QUOTA_RE.search(str(exc)) is not None
+
+
+# Upper bound for a single retry sleep, including any server Retry-After hint.
+MAX_RETRY_DELAY_S = 60.0
+
+
+def _retry_after_s(exc: BaseException) -> Optional[float]:
+    """Return the server's Retry-After hint in seconds, when the error has one."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _noop(*_args: Any) -> None:
+    """Default for optional progress/retry callbacks."""
+
+
+# Name of the last pipeline stage; its final response is the user-facing answer.
+FINAL_AGENT_NAME = "FormatterAgent"
 
 
 def get_model_candidates() -> list[str]:
@@ -63,8 +112,16 @@ async def run_runner_collect_final_text(
     max_attempts: int,
     initial_delay_s: float,
     backoff_factor: float,
-    on_retry: Optional[Callable[[int, int, float], None]] = None,
+    on_retry: Callable[[int, int, float], None] = _noop,
+    final_author: Optional[str] = None,
 ) -> str:
+    """Run *runner* and return the last non-empty final-response text.
+
+    When *final_author* is given, iteration stops at that agent's final
+    response and the event stream is closed immediately instead of being
+    drained. Every sub-agent of a SequentialAgent emits its own final
+    response, so this must name the last stage, not the first.
+    """
     attempt = 0
     delay = initial_delay_s
     last_exc: Optional[BaseException] = None
@@ -73,15 +130,25 @@ async def run_runner_collect_final_text(
         attempt += 1
         try:
             final_text = ""
-            async for event in runner.run_async(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=query_content,
-            ):
-                if event.is_final_response() and event.content and event.content.parts:
+            async with contextlib.aclosing(
+                runner.run_async(
+                    user_id=user_id,
+                    session_id=session_id,
+                    new_message=query_content,
+                )
+            ) as events:
+                async for event in events:
+                    if not (
+                        event.is_final_response()
+                        and event.content
+                        and event.content.parts
+                    ):
+                        continue
                     text = event.content.parts[0].text
                     if text and text != "None":
                         final_text = text
+                        if event.author == final_author:
+                            break
             return final_text
         except Exception as e:
             last_exc = e
@@ -90,44 +157,20 @@ async def run_runner_collect_final_text(
             if not is_transient_model_error(e) or attempt >= max_attempts:
                 raise
 
-            if on_retry is not None:
-                on_retry(attempt, max_attempts, delay)
-            await asyncio.sleep(delay)
-            delay *= backoff_factor
+            # Up to +20% jitter keeps concurrent callers from retrying in lockstep.
+            sleep_s = _retry_after_s(e) or delay * random.uniform(1.0, 1.2)
+            sleep_s = min(sleep_s, MAX_RETRY_DELAY_S)
+            on_retry(attempt, max_attempts, sleep_s)
+            await asyncio.sleep(sleep_s)
+            delay = min(delay * backoff_factor, MAX_RETRY_DELAY_S)
 
     if last_exc:
         raise last_exc
     return ""
 
 
-def initialize_multi_agent_system(
-    model_name: Optional[str] = None,
-    after_agent_callback: Optional[Callable[..., Any]] = None,
-    announce: Optional[Callable[[str], None]] = None,
-):
-    if announce is not None:
-        announce(
-            "\n🔧 Initializing Enhanced Multi-Agent System with Sessions & Memory..."
-        )
-
-    model_name = (
-        model_name or os.environ.get("GEMINI_MODEL") or "gemini-2.5-flash"
-    ).strip()
-
-    retry_config = types.HttpRetryOptions(
-        attempts=5,
-        exp_base=7,
-        initial_delay=1,
-        http_status_codes=[500, 503, 504],
-    )
-
-    research_agent = LlmAgent(
-        name="ResearchAgent",
-        model=Gemini(
-            model=model_name,
-            retry_options=retry_config,
-        ),
-        instruction="""
+# Agent instructions; fixed text shared by every pipeline build.
+_RESEARCH_INSTRUCTION = """
 You are a specialized research agent. Your ONLY job is to use the `google_search` tool
 to find real, currently-operating places that match the user's city and preferences.
 
@@ -156,57 +199,26 @@ Description: <1–2 sentence factual description>
 WhyMatch: <1 sentence tying it to the user's preferences / taste signals>
 
 Do not add commentary before or after the list. The next agent will parse these
-fields, so stay on-format.""",
-        tools=[google_search],
-        output_key="research_findings",
-    )
-    if announce is not None:
-        announce("✅ ResearchAgent created (with google_search tool)")
-
-    calculation_agent = LlmAgent(
-        name="CalculationAgent",
-        model=Gemini(
-            model=model_name,
-            retry_options=retry_config,
-        ),
-        instruction="""You are a specialized calculator that ONLY responds with Python code.
-        
-Your task is to take scoring data and calculate final relevance scores.
-
-**RULES:**
-1. Your output MUST be ONLY a Python code block
-2. Do NOT write any text before or after the code
-3. The Python code MUST calculate the result
-4. The Python code MUST print the final result to stdout
-5. You are PROHIBITED from performing the calculation yourself
-
-Generate Python code that calculates weighted scores based on the provided data.""",
-        code_executor=BuiltInCodeExecutor(),
-        output_key="calculation_results",
-    )
-    if announce is not None:
-        announce("✅ CalculationAgent created (with BuiltInCodeExecutor)")
+fields, so stay on-format."""
 
-    filter_agent_kwargs: Dict[str, Any] = {
-        "name": "FilterAgent",
-        "model": Gemini(
-            model=model_name,
-            retry_options=retry_config,
-        ),
-        "instruction": """
+
+_FILTER_INSTRUCTION = """
 You are a filtering and ranking specialist. The previous agent produced a structured
 list of candidate places (fields: Name, Type, Neighborhood, DistanceKm, Description,
 WhyMatch). Parse it and rank them.
 
 Procedure:
-1. For each place, call `get_place_category_boost(category=Type, preferences=...)`
-   to get a category-match boost.
-2. If `DistanceKm` is a number, call `calculate_distance_score(distance_km=...)`
-   for a location score. If it is "unknown", skip distance and note it.
-3. Use the `CalculationAgent` to produce Python code that combines the available
-   scores into a final rating on a **1–10 scale** (weight category heavier than
-   distance; if distance is unknown, use category boost + relevance to preferences).
-4. Always check the `"status"` field in tool responses; skip or warn on errors.
+1. Call `get_place_category_boosts_batch(categories=[...], preferences=...)` ONCE
+   with every place's Type, in list order. `results[i]` is the boost for place i.
+2. Call `calculate_distance_scores_batch(distances_km=[...])` ONCE with the
+   numeric `DistanceKm` values, in list order, skipping places whose distance is
+   "unknown" (note those). `results[i]` matches the i-th distance you passed.
+3. Call `compute_final_scores(category_boosts=[...], distance_scores=[...])` ONCE
+   with one entry per place, in list order, using a distance score of 0 for
+   places whose distance is unknown or errored. `scores[i]` is place i's final
+   rating on a **1–10 scale**.
+4. Always check the `"status"` field in tool responses and in each entry of
+   `results`; skip or warn on errors.
 5. Select the top **5** places and sort by final score descending.
 
 **Output format (strict)** — the formatter will parse it. One block per place,
@@ -219,30 +231,10 @@ DistanceKm: <number or "unknown">
 Score: <final 1–10 rating, one decimal allowed>
 ScoreBreakdown: category=<n>, distance=<n or "n/a">
 Description: <keep the factual sentence from research>
-WhyMatch: <refined one-sentence reason this place suits the user>""",
-        "tools": [
-            FunctionTool(func=calculate_distance_score),
-            FunctionTool(func=get_place_category_boost),
-            AgentTool(agent=calculation_agent),
-        ],
-        "output_key": "filtered_results",
-    }
-    if after_agent_callback is not None:
-        filter_agent_kwargs["after_agent_callback"] = after_agent_callback
+WhyMatch: <refined one-sentence reason this place suits the user>"""
 
-    filter_agent = LlmAgent(**filter_agent_kwargs)
-    if announce is not None:
-        announce(
-            "✅ FilterAgent created (with custom FunctionTools + AgentTool + Memory)"
-        )
 
-    formatter_agent = LlmAgent(
-        name="FormatterAgent",
-        model=Gemini(
-            model=model_name,
-            retry_options=retry_config,
-        ),
-        instruction="""
+_FORMATTER_INSTRUCTION = """
 You are the presentation specialist. You receive the ranked, structured list from
 the FilterAgent and turn it into the final user-facing answer.
 
@@ -300,32 +292,76 @@ the FilterAgent and turn it into the final user-facing answer.
   text on its own line under the score line, e.g. *category 3 · distance 8*.
 - If a field is "unknown", omit that fragment entirely rather than printing
   "unknown".
-- Do not invent facts not present in the filtered input.""",
+- Do not invent facts not present in the filtered input."""
+
+
+def initialize_multi_agent_system(
+    model_name: Optional[str] = None,
+    after_agent_callback: Optional[Callable[..., Any]] = None,
+    announce: Callable[[str], None] = _noop,
+):
+    announce("\n🔧 Initializing Enhanced Multi-Agent System with Sessions & Memory...")
+
+    model_name = (
+        model_name or os.environ.get("GEMINI_MODEL") or "gemini-2.5-flash"
+    ).strip()
+
+    research_agent = LlmAgent(
+        name="ResearchAgent",
+        model=_gemini(model_name),
+        instruction=_RESEARCH_INSTRUCTION,
+        tools=[google_search],
+        output_key="research_findings",
+    )
+    announce("✅ ResearchAgent created (with google_search tool)")
+
+    filter_agent_kwargs: Dict[str, Any] = {
+        "name": "FilterAgent",
+        "model": _gemini(model_name),
+        "instruction": _FILTER_INSTRUCTION,
+        "tools": [
+            _DISTANCE_TOOL,
+            _CATEGORY_TOOL,
+            _FINAL_SCORE_TOOL,
+        ],
+        "output_key": "filtered_results",
+    }
+    if after_agent_callback is not None:
+        filter_agent_kwargs["after_agent_callback"] = after_agent_callback
+
+    filter_agent = LlmAgent(**filter_agent_kwargs)
+    announce("✅ FilterAgent created (with custom FunctionTools)")
+
+    formatter_agent = LlmAgent(
+        name=FINAL_AGENT_NAME,
+        model=_gemini(model_name),
+        instruction=_FORMATTER_INSTRUCTION,
         output_key="final_recommendations",
     )
-    if announce is not None:
-        announce("✅ FormatterAgent created")
+    announce("✅ FormatterAgent created")
 
     root_agent = SequentialAgent(
         name="EnhancedPlacesSearchPipeline",
         sub_agents=[research_agent, filter_agent, formatter_agent],
     )
 
-    if announce is not None:
-        announce("\n✅ Enhanced Multi-Agent Pipeline created")
-        announce(
-            "📋 Pipeline: ResearchAgent → FilterAgent (with tools) → FormatterAgent"
-        )
-        announce("🔧 Custom Tools: calculate_distance_score, get_place_category_boost")
-        announce("🤖 Agent Tools: CalculationAgent (code executor)")
+    announce("\n✅ Enhanced Multi-Agent Pipeline created")
+    announce("📋 Pipeline: ResearchAgent → FilterAgent (with tools) → FormatterAgent")
+    announce(
+        "🔧 Custom Tools: calculate_distance_scores_batch, "
+        "get_place_category_boosts_batch, compute_final_scores"
+    )
 
     return root_agent
 
 
+@functools.cache
 def initialize_services() -> Tuple[Any, Any]:
-    """Return in-memory session and memory services.
+    """Return the process-wide in-memory session and memory services.
 
-    Topic persistence is managed externally via the topic_preferences module.
+    The pair is created once and shared by every caller, so Runners bound to
+    it can be reused across requests. Topic persistence is managed externally
+    via the topic_preferences module and does not vary these services.
     """
     return InMemorySessionService(), InMemoryMemoryService()
 
@@ -349,15 +385,29 @@ def create_app(
 
 def generate_session_id() -> str:
     """Return a unique session ID for a single request."""
-    return str(uuid.uuid4())
+    return uuid.uuid4().hex
+
+
+# What session services raise for a clashing or unreachable session.
+_SESSION_ERRORS = (AlreadyExistsError, ValueError, RuntimeError, ConnectionError)
 
 
 async def create_or_retrieve_session(
     session_service,
     app_name: str,
     user_id: str,
-    session_id: str,
+    session_id: Optional[str] = None,
 ) -> Tuple[Any, bool]:
+    """Return ``(session, created)``, trying to create the session first.
+
+    Without a *session_id* a fresh one is generated; it cannot name an
+    existing session, so nothing is looked up. A supplied ID that already
+    exists (a resumed session, or one another caller just created) is
+    fetched instead.
+    """
+    fresh = session_id is None
+    if fresh:
+        session_id = generate_session_id()
     try:
         session = await session_service.create_session(
             app_name=app_name,
@@ -365,15 +415,21 @@ async def create_or_retrieve_session(
             session_id=session_id,
         )
         return session, True
-    except (ValueError, RuntimeError, ConnectionError):
-        try:
-            session = await session_service.get_session(
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-            )
-            return session, False
-        except (ValueError, RuntimeError, ConnectionError) as retrieve_error:
+    except _SESSION_ERRORS as create_error:
+        if fresh:
             raise RuntimeError(
-                f"Failed to create or retrieve session: {retrieve_error}"
-            )
+                f"Failed to create session: {create_error}"
+            ) from create_error
+    try:
+        session = await session_service.get_session(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+        )
+    except _SESSION_ERRORS as retrieve_error:
+        raise RuntimeError(
+            f"Failed to create or retrieve session: {retrieve_error}"
+        ) from retrieve_error
+    if session is None:
+        raise RuntimeError(f"Failed to create or retrieve session {session_id!r}")
+    return session, False
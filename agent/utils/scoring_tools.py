@@ -2,6 +2,45 @@
 Shared scoring tools for places search
 """
 
+import bisect
+import functools
+import re
+from typing import NamedTuple
+
+# Upper bounds (inclusive, km) of each distance band and the score it earns;
+# anything beyond the last bound gets the final score.
+_DIST_THRESHOLDS = (1.0, 3.0, 5.0, 10.0)
+_DIST_SCORES = (10, 8, 6, 4, 2)
+
+# Related-category vocabularies: exact membership for the place category,
+# one precompiled alternation for the substring scan over preferences.
+_FOOD = frozenset({"restaurant", "cafe", "coffee", "bar", "food"})
+_CULTURE = frozenset({"museum", "gallery", "theater", "art"})
+_OUTDOOR = frozenset({"park", "garden", "hiking", "beach", "outdoor", "nature"})
+
+_FOOD_RE = re.compile("|".join(sorted(_FOOD)))
+_CULTURE_RE = re.compile("|".join(sorted(_CULTURE)))
+_OUTDOOR_RE = re.compile("|".join(sorted(_OUTDOOR)))
+
+
+class _Boost(NamedTuple):
+    boost: int
+    reason: str
+
+
+# Every possible outcome is a fixed, immutable record built once here; the
+# dict the tool returns is only assembled at the FunctionTool boundary.
+_DIRECT_MATCH = _Boost(3, "Direct match")
+_NO_MATCH = _Boost(0, "No special match")
+
+# Category -> (vocabulary regex, result). The vocabularies are disjoint, so a
+# single dict lookup replaces checking each bucket in turn.
+_CATEGORY_BUCKETS = {
+    **{cat: (_FOOD_RE, _Boost(2, "Food-related match")) for cat in _FOOD},
+    **{cat: (_CULTURE_RE, _Boost(2, "Culture-related match")) for cat in _CULTURE},
+    **{cat: (_OUTDOOR_RE, _Boost(2, "Outdoor-related match")) for cat in _OUTDOOR},
+}
+
 
 def calculate_distance_score(distance_km: float) -> dict:
     """Calculates a relevance score based on distance from city center.
@@ -17,18 +56,8 @@ def calculate_distance_score(distance_km: float) -> dict:
     if distance_km < 0:
         return {"status": "error", "error_message": "Distance cannot be negative"}
 
-    # Closer = higher score (10 points max)
-    if distance_km <= 1:
-        score = 10
-    elif distance_km <= 3:
-        score = 8
-    elif distance_km <= 5:
-        score = 6
-    elif distance_km <= 10:
-        score = 4
-    else:
-        score = 2
-
+    # Closer = higher score (10 points max); bisect_left keeps bounds inclusive
+    score = _DIST_SCORES[bisect.bisect_left(_DIST_THRESHOLDS, distance_km)]
     return {"status": "success", "score": score, "distance_km": distance_km}
 
 
@@ -44,27 +73,101 @@ def get_place_category_boost(category: str, preferences: str) -> dict:
         Success: {"status": "success", "boost": 2}
         Error: {"status": "error", "error_message": "..."}
     """
+    result = _category_boost(category, preferences)
+    return {"status": "success", "boost": result.boost, "reason": result.reason}
+
+
+# The FilterAgent scores every place against the same preferences string and
+# categories repeat across places, so most calls in a pass are cache hits. The
+# results are immutable records, which makes them safe to share from a cache.
+@functools.lru_cache(maxsize=1024)
+def _category_boost(category: str, preferences: str) -> _Boost:
+    """Classify a category/preferences pair into a precomputed boost record."""
     category = category.lower()
     preferences = preferences.lower()
 
     # Direct match gives highest boost
     if category in preferences or preferences in category:
-        return {"status": "success", "boost": 3, "reason": "Direct match"}
+        return _DIRECT_MATCH
 
     # Related categories get medium boost
-    food_related = ["restaurant", "cafe", "coffee", "bar", "food"]
-    culture_related = ["museum", "gallery", "theater", "art"]
-    outdoor_related = ["park", "garden", "hiking", "beach", "outdoor", "nature"]
-
-    if category in food_related and any(term in preferences for term in food_related):
-        return {"status": "success", "boost": 2, "reason": "Food-related match"}
-    if category in culture_related and any(
-        term in preferences for term in culture_related
-    ):
-        return {"status": "success", "boost": 2, "reason": "Culture-related match"}
-    if category in outdoor_related and any(
-        term in preferences for term in outdoor_related
-    ):
-        return {"status": "success", "boost": 2, "reason": "Outdoor-related match"}
-
-    return {"status": "success", "boost": 0, "reason": "No special match"}
+    bucket = _CATEGORY_BUCKETS.get(category)
+    if bucket is not None and bucket[0].search(preferences) is not None:
+        return bucket[1]
+
+    return _NO_MATCH
+
+
+def calculate_distance_scores_batch(distances_km: list[float]) -> dict:
+    """Calculates distance scores for several places in a single tool call.
+
+    Args:
+        distances_km: Distances in kilometers from city center, one per place
+
+    Returns:
+        Dictionary with status and one calculate_distance_score result per
+        input, in the same order.
+        Success: {"status": "success", "results": [{"status": "success", ...}]}
+    """
+    return {
+        "status": "success",
+        "results": [calculate_distance_score(d) for d in distances_km],
+    }
+
+
+def get_place_category_boosts_batch(categories: list[str], preferences: str) -> dict:
+    """Calculates category boosts for several places in a single tool call.
+
+    Args:
+        categories: Categories of the places (e.g., ["restaurant", "museum"])
+        preferences: User's stated preferences, shared by every place
+
+    Returns:
+        Dictionary with status and one get_place_category_boost result per
+        category, in the same order.
+        Success: {"status": "success", "results": [{"status": "success", ...}]}
+    """
+    return {
+        "status": "success",
+        "results": [get_place_category_boost(c, preferences) for c in categories],
+    }
+
+
+# Final rating weights: category relevance counts more than distance. Boosts
+# (0-3) are rescaled to the 0-10 range of distance scores before weighting.
+_CATEGORY_WEIGHT = 0.6
+_DISTANCE_WEIGHT = 0.4
+_MAX_BOOST = 3
+
+
+def compute_final_scores(
+    category_boosts: list[int], distance_scores: list[int]
+) -> dict:
+    """Combines category boosts and distance scores into final 1-10 ratings.
+
+    Args:
+        category_boosts: Category boost (0-3) for each place
+        distance_scores: Distance score (2-10) for each place, in the same
+            order; use 0 when a place's distance is unknown
+
+    Returns:
+        Dictionary with status and one rating per place, in input order.
+        Success: {"status": "success", "scores": [8.0, 5.2]}
+        Error: {"status": "error", "error_message": "..."}
+    """
+    if len(category_boosts) != len(distance_scores):
+        return {
+            "status": "error",
+            "error_message": "category_boosts and distance_scores must have the same length",
+        }
+
+    scores = []
+    for boost, distance in zip(category_boosts, distance_scores):
+        category = boost * 10 / _MAX_BOOST
+        if distance > 0:
+            rating = _CATEGORY_WEIGHT * category + _DISTANCE_WEIGHT * distance
+        else:
+            # Unknown distance: rate on category relevance alone
+            rating = category
+        scores.append(round(min(max(rating, 1.0), 10.0), 1))
+    return {"status": "success", "scores": scores}
@@ -46,6 +46,17 @@ class TopicPreference(_Base):
     version = Column(Integer, nullable=False, default=0)
 
 
+# Pool sizing for the per-instance Postgres engine. A search does at most one
+# read and one write, so a small warm pool covers Cloud Run's per-instance
+# concurrency without exhausting Cloud SQL's connection limit across instances.
+# Recycling stays below the idle timeouts of Cloud SQL proxies and NAT gateways.
+_POSTGRES_POOL_KWARGS = {
+    "pool_pre_ping": True,
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_recycle": 300,
+}
+
 _engine: Optional[AsyncEngine] = None
 _session_factory: Optional[sessionmaker] = None
 _init_lock = asyncio.Lock()
@@ -106,7 +117,8 @@ async def _ensure_initialized() -> None:
         db_url = _build_db_url()
         kwargs = _build_engine_kwargs(db_url)
         if db_url.startswith("postgresql"):
-            kwargs.setdefault("pool_pre_ping", True)
+            for key, value in _POSTGRES_POOL_KWARGS.items():
+                kwargs.setdefault(key, value)
         engine = create_async_engine(db_url, **kwargs)
         async with engine.begin() as conn:
             await conn.run_sync(_Base.metadata.create_all)
@@ -154,10 +166,26 @@ async def get_preferences(topic: str) -> str:
         return row.preferences if row is not None else ""
 
 
-async def _summarize(preferences: str, model_name: str) -> str:
-    from google import genai
+# One google-genai client (and its HTTP connection pool) is shared by every
+# summarisation call. Its async transport is bound to the event loop that first
+# used it, so a new loop (e.g. a fresh test loop) gets a fresh client.
+_genai_client = None
+_genai_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_genai_client():
+    global _genai_client, _genai_client_loop
+    loop = asyncio.get_running_loop()
+    if _genai_client is None or _genai_client_loop is not loop:
+        from google import genai
 
-    client = genai.Client()
+        _genai_client = genai.Client()
+        _genai_client_loop = loop
+    return _genai_client
+
+
+async def _summarize(preferences: str, model_name: str) -> str:
+    client = _get_genai_client()
     response = await client.aio.models.generate_content(
         model=model_name,
         contents=_SUMMARIZE_PROMPT.format(preferences=preferences),
@@ -11,7 +11,8 @@ import os
 import asyncio
 import logging
 import time
-import concurrent.futures
+from collections import OrderedDict
+from typing import Optional
 
 import gradio as gr
 import httpx
@@ -33,6 +34,13 @@ AGENT_API_URL = os.environ.get("AGENT_API_URL", "http://localhost:8080")
 PROXY_AUTH_TOKEN = os.environ.get("PROXY_AUTH_TOKEN", "")
 TURNSTILE_SITE_KEY = os.environ.get("TURNSTILE_SITE_KEY", "")
 
+# Strip CR/LF from user input before logging to prevent log injection
+_LOG_TRANSLATE = str.maketrans("", "", "\r\n")
+
+# Fixed for the process lifetime, so build them once instead of per search.
+_SEARCH_URL = f"{AGENT_API_URL.rstrip('/')}/search"
+_RELAY_HEADERS = {"X-Proxy-Auth": PROXY_AUTH_TOKEN}
+
 if not PROXY_AUTH_TOKEN:
     logger.warning(
         "PROXY_AUTH_TOKEN not set — relay requests will be rejected by the API"
@@ -45,6 +53,82 @@ if not TURNSTILE_SITE_KEY:
 # Relay Function
 # ============================================================================
 
+# One pooled HTTP client serves every relay call, so the TLS session and
+# keep-alive connections to the Agent API survive between searches. Its
+# connections belong to the event loop that created it (Gradio's, in
+# production), so a different loop gets a fresh client. httpx drops idle
+# connections after 5s by default, which is shorter than the gap between most
+# searches; keep them around long enough to actually be reused.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=300.0,
+)
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(timeout=300.0, limits=_HTTP_LIMITS)
+        _http_client_loop = loop
+    return _http_client
+
+
+def _read_result_cache_ttl_s() -> float:
+    """Return ``SEARCH_CACHE_TTL_S`` as seconds; 0 disables the result cache."""
+    raw = os.environ.get("SEARCH_CACHE_TTL_S", "").strip()
+    if not raw:
+        return 3600.0
+    try:
+        ttl = float(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid SEARCH_CACHE_TTL_S=%r", raw)
+        return 3600.0
+    return max(ttl, 0.0)
+
+
+# Transient (no-topic) searches with identical inputs are answered from a small
+# TTL cache instead of re-running the multi-agent pipeline. Topic searches are
+# never cached: they read and extend per-topic history on every call. Only
+# complete results are stored, never errors or degraded fallbacks. This is the
+# only result cache: the Agent API does not cache, so one TTL bounds result age.
+#
+# Trade-off: a cache hit is served by the relay without the Agent API ever
+# verifying that request's Turnstile token, so a repeat of a cached public
+# search only needs a non-empty token. Only a request whose token the API did
+# verify can fill the cache, and a hit costs no model call.
+_RESULT_CACHE_TTL_S = _read_result_cache_ttl_s()
+_RESULT_CACHE_MAX_SIZE = 512
+_result_cache: "OrderedDict[tuple[str, str], tuple[float, str]]" = OrderedDict()
+
+
+def _cache_key(city: str, preferences: str) -> tuple[str, str]:
+    """Case- and whitespace-insensitive key, so trivially different spellings of
+    the same search share one entry."""
+    return " ".join(city.lower().split()), " ".join(preferences.lower().split())
+
+
+def _cache_get(key: tuple[str, str]) -> Optional[str]:
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > _RESULT_CACHE_TTL_S:
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return result
+
+
+def _cache_put(key: tuple[str, str], result: str) -> None:
+    _result_cache[key] = (time.monotonic(), result)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > _RESULT_CACHE_MAX_SIZE:
+        _result_cache.popitem(last=False)
+
 
 async def _relay_search(
     city: str,
@@ -53,29 +137,48 @@ async def _relay_search(
     token: str,
 ) -> str:
     """Forward search request server-side to the Cloud Run Agent API."""
+    # Normalise once up front: whitespace-only fields count as empty, and the
+    # stripped values are what gets cached and sent.
+    city, preferences = (city or "").strip(), (preferences or "").strip()
     if not city or not preferences:
         return "Please enter both a city name and your preferences."
 
     if not token:
         return "Please complete the security verification before searching."
 
+    topic_value = (topic or "").strip() or None
+    cache_key = (
+        _cache_key(city, preferences)
+        if topic_value is None and _RESULT_CACHE_TTL_S > 0
+        else None
+    )
+    if cache_key is not None:
+        # Served before Turnstile verification; see the trade-off above.
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
     payload = {
         "city": city,
         "preferences": preferences,
-        "topic": topic.strip() or None,
+        "topic": topic_value,
         "turnstile_token": token,
     }
-    headers = {"X-Proxy-Auth": PROXY_AUTH_TOKEN}
 
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            resp = await client.post(
-                f"{AGENT_API_URL}/search",
-                json=payload,
-                headers=headers,
-            )
+        resp = await _get_http_client().post(
+            _SEARCH_URL,
+            json=payload,
+            headers=_RELAY_HEADERS,
+        )
         if resp.status_code == 200:
-            return resp.json().get("result", "No results returned.")
+            data = resp.json()
+            result = data.get("result")
+            if not result:
+                return "No results returned."
+            if cache_key is not None and not data.get("degraded", True):
+                _cache_put(cache_key, result)
+            return result
         logger.error("Agent API returned HTTP %s: %s", resp.status_code, resp.text)
         return f"The search service returned an error (HTTP {resp.status_code}). Please try again."
     except httpx.TimeoutException:
@@ -86,631 +189,31 @@ async def _relay_search(
         return "Could not reach the search service. Please try again later."
 
 
-def sync_relay_search(
-    city: str,
-    preferences: str,
-    topic: str,
-    token: str,
-) -> str:
-    """Synchronous wrapper for the async relay function."""
-    logger.debug("relay called: city=%s, token_present=%s", city, bool(token))
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-    if loop and loop.is_running():
-        import concurrent.futures
-
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            return pool.submit(
-                asyncio.run, _relay_search(city, preferences, topic, token)
-            ).result()
-    return asyncio.run(_relay_search(city, preferences, topic, token))
-
-
 # ============================================================================
 # Gradio UI
 # ============================================================================
 
-custom_css = """
-@import url('https://fonts.googleapis.com/css2?family=Exo+2:wght@300;400;500;600;700&display=swap');
-
-:root {
-    color-scheme: dark !important;
-    --bg-primary: #07090f;
-    --bg-secondary: #0b1220;
-    --panel-bg: linear-gradient(180deg, rgba(8,18,33,0.92) 0%, rgba(10,23,43,0.88) 100%);
-    --panel-border: rgba(74, 208, 255, 0.20);
-    --text-primary: #e8f7ff;
-    --text-secondary: rgba(213, 239, 255, 0.78);
-    --text-muted: rgba(173, 220, 246, 0.48);
-    --accent: #5de4ff;
-    --accent-strong: #1fc8ff;
-    --accent-soft: rgba(93, 228, 255, 0.18);
-    --divider: rgba(93, 228, 255, 0.14);
-    --button-bg: linear-gradient(135deg, #00a9d6 0%, #33d6ff 100%);
-    --button-hover: linear-gradient(135deg, #10b7df 0%, #5de4ff 100%);
-    --field-border: rgba(93, 228, 255, 0.22);
-    --field-focus: #5de4ff;
-    --page-glow: radial-gradient(circle at top center, rgba(31, 200, 255, 0.18), transparent 38%);
-}
-
-body, .gradio-container, .gradio-container * {
-    font-family: 'Exo 2', sans-serif !important;
-}
-
-html,
-body,
-#root {
-    width: 100% !important;
-    margin: 0 !important;
-    padding: 0 !important;
-    background:
-        var(--page-glow),
-        radial-gradient(circle at 20% 18%, rgba(93, 228, 255, 0.08), transparent 22%),
-        linear-gradient(180deg, var(--bg-secondary) 0%, var(--bg-primary) 100%) !important;
-    color: var(--text-primary) !important;
-}
-
-html,
-body,
-#root {
-    min-height: 100vh !important;
-}
-
-.app,
-.wrap,
-.contain,
-.main,
-footer {
-    background: transparent !important;
-    background-color: transparent !important;
-}
-
-.gradio-container {
-    background-image: none !important;
-}
-
-.gradio-container::before,
-.gradio-container::after,
-.app::before,
-.app::after,
-.main::before,
-.main::after {
-    background: transparent !important;
-}
-
-.gradio-container {
-    width: clamp(280px, 100%, 860px) !important;
-    margin: 0 auto !important;
-    box-sizing: border-box !important;
-    background: linear-gradient(180deg, rgba(6, 12, 22, 0.78) 0%, rgba(7, 10, 16, 0.80) 100%) !important;
-    border: 1px solid rgba(93, 228, 255, 0.14) !important;
-    border-radius: 14px !important;
-    box-shadow: 0 14px 48px rgba(0,0,0,0.40), 0 0 24px rgba(31,200,255,0.10) !important;
-    padding: 12px 4% 18px 4% !important;
-}
-
-.md-title-simple {
-    font-size: 2.55rem !important;
-    font-weight: 300 !important;
-    letter-spacing: 0.14em !important;
-    color: #e9f9ff !important;
-    margin: 0 !important;
-    text-transform: uppercase !important;
-    line-height: 0.96 !important;
-    text-shadow:
-        0 0 10px rgba(255, 255, 255, 0.20),
-        0 0 20px rgba(93, 228, 255, 0.14),
-        0 1px 0 rgba(8, 20, 34, 0.44);
-}
-
-.md-title-frame {
-    position: relative;
-    margin: 24px 0 20px 0;
-    padding: 10px 0 12px 0;
-    display: block;
-    width: 100%;
-    text-align: center;
-}
-
-.md-title-frame::before,
-.md-title-frame::after {
-    content: "";
-    position: absolute;
-    left: 0;
-    width: 100%;
-    height: 2px;
-    background: linear-gradient(90deg, transparent 0%, rgba(93, 228, 255, 0.42) 12%, rgba(93, 228, 255, 0.95) 50%, rgba(93, 228, 255, 0.42) 88%, transparent 100%);
-    box-shadow: 0 0 10px rgba(93, 228, 255, 0.20);
-}
-
-.md-title-frame .md-title-simple {
-    display: inline-block;
-}
-
-.md-title-frame::before {
-    top: 0;
-}
-
-.md-title-frame::after {
-    bottom: 0;
-}
-
-.md-card,
-.md-output {
-    position: relative;
-}
-
-.md-card {
-    overflow: hidden;
-}
-
-.md-output {
-    overflow: visible;
-}
-
-.md-card::before,
-.md-output::before {
-    content: "";
-    position: absolute;
-    inset: 0;
-    background:
-        linear-gradient(90deg, transparent 0%, rgba(93, 228, 255, 0.04) 48%, transparent 100%),
-        linear-gradient(0deg, transparent 0%, rgba(93, 228, 255, 0.03) 48%, transparent 100%);
-    background-size: 160px 160px;
-    pointer-events: none;
-}
-
-/* === Form Card === */
-.md-card {
-    background: var(--panel-bg) !important;
-    border-radius: 10px !important;
-    border: 1px solid var(--panel-border) !important;
-    box-shadow: 0 10px 36px rgba(0,0,0,0.30), 0 0 28px rgba(31,200,255,0.10) !important;
-    backdrop-filter: blur(12px);
-    padding: 24px 32px 32px 32px !important;
-}
-
-/* === Text Fields === */
-.md-card .form,
-.md-card .block,
-.md-card .block.padded,
-.md-card label.container {
-    background: transparent !important;
-    background-color: transparent !important;
-    border: none !important;
-    border-color: transparent !important;
-    box-shadow: none !important;
-    outline: none !important;
-}
-
-.md-card label.container.show_textbox_border {
-    background: transparent !important;
-    background-color: transparent !important;
-    border: 1px solid rgba(93, 228, 255, 0.24) !important;
-    border-radius: 8px !important;
-    padding: 10px 12px 8px 12px !important;
-    box-shadow: none !important;
-}
-
-.md-card label.container.show_textbox_border .input-container {
-    background: transparent !important;
-    background-color: transparent !important;
-    border: none !important;
-    box-shadow: none !important;
-    border-radius: 6px !important;
-    padding: 6px 10px 4px 10px !important;
-}
-
-.gradio-container input,
-.gradio-container textarea {
-    border: none !important;
-    border-bottom: 1px solid var(--field-border) !important;
-    border-radius: 0 !important;
-    background-color: transparent !important;
-    padding: 8px 0 6px 0 !important;
-    font-size: 1rem !important;
-    font-weight: 400 !important;
-    color: var(--text-primary) !important;
-    caret-color: var(--accent) !important;
-    transition: border-color 0.18s ease, box-shadow 0.18s ease !important;
-    box-shadow: none !important;
-    outline: none !important;
-}
-
-.gradio-container input::placeholder,
-.gradio-container textarea::placeholder {
-    color: var(--text-muted) !important;
-}
-
-.gradio-container span[data-testid="block-info"] {
-    color: rgba(207, 241, 255, 0.96) !important;
-    font-weight: 600 !important;
-    letter-spacing: 0.01em !important;
-}
-
-.gradio-container input:focus,
-.gradio-container textarea:focus {
-    border-bottom: 2px solid var(--field-focus) !important;
-    box-shadow: 0 1px 0 0 var(--field-focus), 0 10px 18px -18px var(--field-focus) !important;
-    outline: none !important;
-}
-
-.gradio-container textarea {
-    resize: none !important;
-    overflow-y: hidden !important;
-}
-
-.gradio-container input,
-.gradio-container textarea {
-    width: 100% !important;
-    box-sizing: border-box !important;
-}
-
-/* === Block containers === */
-.gradio-container .block {
-    background: transparent !important;
-    border: none !important;
-    box-shadow: none !important;
-    padding: 8px 0 !important;
-}
-
-/* === Material Button (brand) === */
-.gradio-container button.lg.primary {
-    background: var(--button-bg) !important;
-    color: #03111a !important;
-    border: 1px solid rgba(255,255,255,0.08) !important;
-    border-radius: 999px !important;
-    font-size: 0.86rem !important;
-    font-weight: 700 !important;
-    letter-spacing: 0.14em !important;
-    text-transform: uppercase !important;
-    height: 40px !important;
-    padding: 0 24px !important;
-    box-shadow: 0 8px 24px rgba(31,200,255,0.20), 0 3px 10px rgba(0,0,0,0.18) !important;
-    transition: transform 0.15s ease, box-shadow 0.15s ease, background 0.15s ease !important;
-    margin-top: 16px !important;
-}
-
-.gradio-container button.lg.primary:hover:not(:disabled) {
-    background: var(--button-hover) !important;
-    transform: translateY(-1px);
-    box-shadow: 0 10px 30px rgba(31,200,255,0.26), 0 5px 14px rgba(0,0,0,0.20) !important;
-}
-
-.gradio-container button.lg.primary:disabled {
-    background: rgba(255,255,255,0.10) !important;
-    color: rgba(255,255,255,0.35) !important;
-    box-shadow: none !important;
-}
-
-/* === Output card === */
-.md-output {
-    background: var(--panel-bg) !important;
-    border-radius: 10px !important;
-    border: 1px solid rgba(93, 228, 255, 0.14) !important;
-    box-shadow: 0 8px 28px rgba(0,0,0,0.20), 0 0 24px rgba(31,200,255,0.06) !important;
-    padding: 24px !important;
-    min-height: 110px !important;
-    display: flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-    text-align: center !important;
-}
-
-.md-output [data-testid="status-tracker"] {
-    display: none !important;
-}
-
-.md-output p,
-.md-output li,
-.md-output span,
-.md-output em,
-.md-output strong {
-    color: var(--text-secondary) !important;
-    font-size: 1rem !important;
-    line-height: 1.6 !important;
-    text-align: center !important;
-    margin: 0 auto !important;
-}
-
-.md-output .prose,
-.md-output .gr-markdown,
-.md-output .gr-markdown > div {
-    width: 100% !important;
-    text-align: center !important;
-}
-
-.md-output .gr-markdown {
-    margin: 0 !important;
-}
-
-/* Outer wrappers: no extra padding so the card edge stays clean. */
-.md-output > div,
-.md-output .wrap,
-.md-output .block {
-    margin-top: 0 !important;
-    padding-top: 0 !important;
-    margin-bottom: 0 !important;
-    padding-bottom: 0 !important;
-}
-
-/* Inside .prose (the rendered Markdown), restore generous vertical rhythm
-   so headings, paragraphs, lists and horizontal rules actually breathe. */
-.md-output .prose {
-    margin: 0 !important;
-    padding: 0 !important;
-    text-align: left !important;
-    width: 100% !important;
-}
-
-.md-output .prose > * {
-    margin: 0 0 0.9em 0 !important;
-    padding: 0 !important;
-    text-align: left !important;
-}
-
-.md-output .prose > *:last-child {
-    margin-bottom: 0 !important;
-}
-
-.md-output .prose h2 {
-    font-size: 1.35rem !important;
-    font-weight: 600 !important;
-    color: var(--text-primary) !important;
-    letter-spacing: 0.02em !important;
-    margin: 0.2em 0 0.6em 0 !important;
-    text-align: center !important;
-}
-
-.md-output .prose h3 {
-    font-size: 1.08rem !important;
-    font-weight: 600 !important;
-    color: var(--accent) !important;
-    margin: 1.1em 0 0.4em 0 !important;
-    text-align: left !important;
-}
-
-.md-output .prose hr {
-    border: none !important;
-    height: 1px !important;
-    background: linear-gradient(90deg, transparent 0%, var(--divider) 50%, transparent 100%) !important;
-    margin: 1.2em 0 !important;
-}
-
-.md-output .prose p,
-.md-output .prose li {
-    text-align: left !important;
-    line-height: 1.65 !important;
-}
-
-.md-output .prose ul,
-.md-output .prose ol {
-    padding-left: 1.25em !important;
-    margin: 0.4em 0 0.9em 0 !important;
-}
-
-.md-output .prose strong {
-    color: var(--text-primary) !important;
-}
-
-.md-output .prose em {
-    color: var(--text-muted) !important;
-}
-
-
-/* === Examples table === */
-.gr-samples-table td {
-    font-size: 0.875rem !important;
-    color: var(--text-secondary) !important;
-    padding: 8px 12px !important;
-    border-color: var(--divider) !important;
-    background: transparent !important;
-}
-
-.gr-samples-table th {
-    font-size: 0.72rem !important;
-    font-weight: 600 !important;
-    letter-spacing: 0.12em !important;
-    text-transform: uppercase !important;
-    color: var(--accent-strong) !important;
-    padding: 8px 12px !important;
-    border-bottom: 1px solid var(--divider) !important;
-    background: transparent !important;
-}
-
-/* === Toggle switch (Topic) === */
-.md-toggle {
-    margin: 10px 0 4px 0 !important;
-}
-
-.md-toggle .block,
-.md-toggle .form,
-.md-toggle .wrap {
-    background: transparent !important;
-    border: none !important;
-    box-shadow: none !important;
-    padding: 0 !important;
-}
-
-.md-toggle label {
-    display: inline-flex !important;
-    align-items: center !important;
-    gap: 12px !important;
-    cursor: pointer !important;
-    background: transparent !important;
-    border: none !important;
-    padding: 0 !important;
-    color: var(--text-primary) !important;
-    font-weight: 600 !important;
-    letter-spacing: 0.01em !important;
-}
+# Served as a static, browser-cacheable stylesheet linked from <head> rather
+# than inlined into the app config that every page load re-fetches.
+_STATIC_DIR = Path(__file__).resolve().parent / "static"
+_CUSTOM_CSS_PATH = _STATIC_DIR / "custom.css"
+gr.set_static_paths(paths=[_STATIC_DIR])
 
-.md-toggle label > span,
-.md-toggle label .ml-2 {
-    color: var(--text-primary) !important;
-    font-weight: 600 !important;
-    font-size: 0.95rem !important;
-    margin: 0 !important;
-    padding: 0 !important;
-}
+# Input length limits; keep in sync with SearchRequest in agent/agent_api.py,
+# which rejects longer values with HTTP 422.
+MAX_CITY_LENGTH = 100
+MAX_PREFERENCES_LENGTH = 500
+MAX_TOPIC_LENGTH = 100
 
-.md-toggle label svg,
-.md-toggle label .checkmark,
-.md-toggle label [data-testid="checkbox-icon"] {
-    display: none !important;
-}
+# Relay searches allowed in flight at once, and queued events beyond that
+_SEARCH_CONCURRENCY = 32
+_QUEUE_MAX_SIZE = 128
 
-.md-toggle input[type="checkbox"] {
-    appearance: none !important;
-    -webkit-appearance: none !important;
-    -moz-appearance: none !important;
-    position: relative !important;
-    width: 42px !important;
-    height: 22px !important;
-    min-width: 42px !important;
-    max-width: 42px !important;
-    border-radius: 999px !important;
-    background: rgba(93, 228, 255, 0.10) !important;
-    border: 1px solid rgba(93, 228, 255, 0.28) !important;
-    box-shadow: inset 0 1px 3px rgba(0, 0, 0, 0.35) !important;
-    transition: background 0.22s ease, border-color 0.22s ease, box-shadow 0.22s ease !important;
-    cursor: pointer !important;
-    margin: 0 !important;
-    padding: 0 !important;
-    flex-shrink: 0 !important;
-    vertical-align: middle !important;
-}
-
-.md-toggle input[type="checkbox"]::before {
-    content: "" !important;
-    position: absolute !important;
-    top: 50% !important;
-    left: 2px !important;
-    width: 16px !important;
-    height: 16px !important;
-    border-radius: 50% !important;
-    background: #cfeeff !important;
-    box-shadow: 0 1px 3px rgba(0, 0, 0, 0.45), 0 0 6px rgba(93, 228, 255, 0.25) !important;
-    transform: translateY(-50%) !important;
-    transition: left 0.22s ease, background 0.22s ease, box-shadow 0.22s ease !important;
-}
-
-.md-toggle input[type="checkbox"]:hover {
-    border-color: rgba(93, 228, 255, 0.48) !important;
-}
-
-.md-toggle input[type="checkbox"]:checked {
-    background: linear-gradient(135deg, #00a9d6 0%, #33d6ff 100%) !important;
-    border-color: rgba(93, 228, 255, 0.65) !important;
-    box-shadow: 0 0 10px rgba(31, 200, 255, 0.35), inset 0 1px 2px rgba(0, 0, 0, 0.25) !important;
-}
-
-.md-toggle input[type="checkbox"]:checked::before {
-    left: 22px !important;
-    background: #ffffff !important;
-    box-shadow: 0 1px 4px rgba(0, 0, 0, 0.45), 0 0 8px rgba(255, 255, 255, 0.5) !important;
-}
-
-.md-toggle input[type="checkbox"]:focus-visible {
-    outline: 2px solid var(--accent) !important;
-    outline-offset: 2px !important;
-}
-
-.md-toggle .info,
-.md-toggle span[data-testid="block-info"] + *,
-.md-toggle .wrap > span:not(.ml-2) {
-    color: var(--text-muted) !important;
-    font-size: 0.82rem !important;
-    font-weight: 400 !important;
-    letter-spacing: 0 !important;
-    margin-top: 6px !important;
-    display: block !important;
-}
-
-/* === Turnstile === */
-.turnstile-box {
-    margin: 12px 0 2px 0;
-    display: flex !important;
-    justify-content: center !important;
-    align-items: center !important;
-    width: 100% !important;
-}
-
-.turnstile-hidden {
-    position: absolute !important;
-    width: 0 !important;
-    height: 0 !important;
-    overflow: hidden !important;
-    opacity: 0 !important;
-}
-
-/* === Footer === */
-.md-footer {
-    display: flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-    gap: 5px !important;
-    font-size: 0.76rem !important;
-    color: var(--text-muted) !important;
-    padding: 4px 0 !important;
-    line-height: 1.5 !important;
-    flex-wrap: wrap !important;
-    white-space: normal !important;
-}
-
-.md-footer span {
-    white-space: normal !important;
-    margin: 0 !important;
-    padding: 0 !important;
-    color: var(--text-muted) !important;
-}
-
-.md-footer a {
-    white-space: normal !important;
-    margin: 0 !important;
-    padding: 0 !important;
-    color: var(--accent-strong) !important;
-    text-decoration: none;
-    transition: opacity 0.15s ease;
-}
-
-.md-footer a:hover {
-    opacity: 0.82;
-}
-
-footer,
-.built-with,
-.settings,
-[data-testid="footer"],
-[data-testid="gradio-footer"],
-.gradio-container > footer {
-    display: none !important;
-}
-
-/* === Mobile Layout Optimizations === */
-@media (max-width: 600px) {
-    .gradio-container {
-        padding: 10px 2% 14px 2% !important;
-        border-radius: 0 !important; /* Optional: flush to edges */
-        border-left: none !important;
-        border-right: none !important;
-    }
-    
-    .md-card {
-        padding: 18px 16px 20px 16px !important;
-    }
-    
-    .md-output {
-        padding: 18px 14px !important;
-    }
-    
-    .md-title-simple {
-        font-size: 2rem !important; /* Slightly smaller title to fit better */
-    }
-}
-"""
+# Status texts the search handler yields every spinner tick, built once.
+_SPINNER_FRAMES = ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏")
+_SEARCHING_STATUS = "{} **Searching places**\n\nRunning for {:.1f}s"
+_SEARCHING_LABEL = "Searching…"
+_SEARCH_LABEL = "Search Places"
 
 TOGGLE_TOPIC_JS = """
 (enabled) => {
@@ -721,6 +224,18 @@ TOGGLE_TOPIC_JS = """
 }
 """
 
+# Re-enable the form after a search; the topic field only if its toggle is on.
+UNLOCK_INPUTS_JS = """
+(enabled) => {
+    return [
+        { __type__: "update", interactive: true },
+        { __type__: "update", interactive: true },
+        { __type__: "update", interactive: true },
+        { __type__: "update", interactive: enabled }
+    ];
+}
+"""
+
 # Build the Gradio interface
 with gr.Blocks(
     title="AI Places Search",
@@ -732,6 +247,7 @@ with gr.Blocks(
     with gr.Column(elem_classes=["md-card"]):
         city_input = gr.Textbox(
             label="Place",
+            max_length=MAX_CITY_LENGTH,
             placeholder="Enter a location",
             lines=1,
             max_lines=2,
@@ -739,6 +255,7 @@ with gr.Blocks(
 
         preferences_input = gr.Textbox(
             label="Preferences",
+            max_length=MAX_PREFERENCES_LENGTH,
             placeholder="Describe what you want to explore",
             lines=1,
             max_lines=4,
@@ -753,6 +270,7 @@ with gr.Blocks(
 
         topic_input = gr.Textbox(
             label="Topic Key",
+            max_length=MAX_TOPIC_LENGTH,
             placeholder="Type a common word or unique string",
             interactive=False,
             visible=False,
@@ -791,7 +309,7 @@ with gr.Blocks(
             elem_classes=["turnstile-hidden"],
         )
 
-        search_btn = gr.Button("Search Places", variant="primary", size="lg")
+        search_btn = gr.Button(_SEARCH_LABEL, variant="primary", size="lg")
 
     with gr.Column(elem_classes=["md-output"]):
         output = gr.Markdown(
@@ -799,44 +317,59 @@ with gr.Blocks(
             value="*Enter a place and your preferences, then click Search*",
         )
 
-    # Search button with loading state — disable while running
+    # Inputs locked while a search runs and unlocked again by UNLOCK_INPUTS_JS
+    form_inputs = [city_input, preferences_input, topic_toggle, topic_input]
+
+    # Search button with loading state — disable it and the form while running
     def _start_search():
         return (
-            gr.update(value="⠋ **Searching places**\n\nRunning for 0.0s"),
-            gr.update(interactive=False, value="Searching…"),
+            gr.update(value=_SEARCHING_STATUS.format(_SPINNER_FRAMES[0], 0.0)),
+            gr.update(interactive=False, value=_SEARCHING_LABEL),
+            *(gr.update(interactive=False) for _ in form_inputs),
         )
 
-    def _do_search(city, preferences, topic, topic_enabled, token):
+    # Native async generator: Gradio awaits it on its own event loop, so
+    # concurrent users don't each pin a worker thread for the whole search.
+    async def _do_search(city, preferences, topic, topic_enabled, token):
         effective_topic = topic.strip().lower() if topic_enabled else ""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "relay called: city=%s, token_present=%s",
+                city.translate(_LOG_TRANSLATE),
+                bool(token),
+            )
         started = time.perf_counter()
-        spinner_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
         frame_index = 0
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-            future = pool.submit(
-                sync_relay_search, city, preferences, effective_topic, token
-            )
-            while not future.done():
+        task = asyncio.create_task(
+            _relay_search(city, preferences, effective_topic, token)
+        )
+        try:
+            while not task.done():
                 elapsed = time.perf_counter() - started
-                frame = spinner_frames[frame_index % len(spinner_frames)]
+                frame = _SPINNER_FRAMES[frame_index % len(_SPINNER_FRAMES)]
                 frame_index += 1
                 yield (
-                    f"{frame} **Searching places**\n\nRunning for {elapsed:.1f}s",
-                    gr.update(interactive=False, value="Searching…"),
+                    _SEARCHING_STATUS.format(frame, elapsed),
+                    gr.update(interactive=False, value=_SEARCHING_LABEL),
                 )
-                time.sleep(0.2)
+                await asyncio.wait({task}, timeout=0.2)
 
             try:
-                result = future.result()
-            except (RuntimeError, concurrent.futures.CancelledError):
+                result = task.result()
+            except (RuntimeError, asyncio.CancelledError):
                 logger.exception("Search execution failed")
                 result = "Could not complete the search. Please try again."
+        finally:
+            # The client disconnected or the event was cancelled mid-search
+            task.cancel()
 
-        yield result, gr.update(interactive=True, value="Search Places")
+        yield result, gr.update(interactive=True, value=_SEARCH_LABEL)
 
     search_btn.click(
         fn=_start_search,
-        outputs=[output, search_btn],
+        outputs=[output, search_btn, *form_inputs],
         show_progress="hidden",
+        concurrency_limit=None,
     ).then(
         fn=_do_search,
         inputs=[
@@ -848,10 +381,19 @@ with gr.Blocks(
         ],
         outputs=[output, search_btn],
         show_progress="hidden",
+        concurrency_limit=_SEARCH_CONCURRENCY,
+        concurrency_id="relay-search",
     ).then(
-        fn=lambda: gr.update(value=""),
+        # Clear the spent token in the browser; no Python round-trip needed.
+        fn=None,
         outputs=[turnstile_token],
-        js="() => { try { if (window.turnstile) { window.turnstile.reset(); } } catch (e) { console.error('[Turnstile] reset failed', e); } return []; }",
+        js="() => { try { if (window.turnstile) { window.turnstile.reset(); } } catch (e) { console.error('[Turnstile] reset failed', e); } return ''; }",
+        show_progress="hidden",
+    ).then(
+        fn=None,
+        inputs=[topic_toggle],
+        outputs=form_inputs,
+        js=UNLOCK_INPUTS_JS,
         show_progress="hidden",
     )
 
@@ -879,6 +421,13 @@ with gr.Blocks(
     )
 
 
+# Let concurrent users' searches run side by side; each one is an async relay
+# call that spends its time waiting on the Agent API. Searches share one
+# bounded pool, the instant status update is unlimited, and a full queue
+# rejects new clicks instead of letting waiting times grow without limit.
+demo.queue(default_concurrency_limit=_SEARCH_CONCURRENCY, max_size=_QUEUE_MAX_SIZE)
+
+
 # ============================================================================
 # Launch
 # ============================================================================
@@ -889,9 +438,9 @@ if __name__ == "__main__":
         server_port=7860,
         share=False,
         theme=gr.themes.Base(),
-        css=custom_css,
         head=f"""
     <meta name="color-scheme" content="dark">
+    <link rel="stylesheet" href="/gradio_api/file={_CUSTOM_CSS_PATH}">
     <script>
     // Force dark mode regardless of device preference (iPhones in light mode would
     // otherwise render Gradio's light theme variables and look wrong).
@@ -996,5 +545,5 @@ if __name__ == "__main__":
         applyMapMeShellTheme();
     }});
     </script>
-    """,  # noqa: F541
+    """,
     )
@@ -5,12 +5,12 @@ Centralises the postgres:16-alpine testcontainer so both
 preferences store without paying the start-up cost twice.
 """
 
-import os
 import sys
+from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 _PG_IMAGE = "postgres:16-alpine"
 
@@ -1,14 +1,18 @@
 """
-Unit tests for the Agent API security layer.
+Unit tests for the Agent API.
 
-Tests X-Proxy-Auth verification, Turnstile validation,
-and the /health endpoint without requiring external services.
+Tests X-Proxy-Auth verification, Turnstile validation, request validation,
+the /health endpoint and the search orchestration in agent_api (prompt
+building, batching, model fallback, degraded results) without requiring
+external services. Pipeline internals live in test_core.py.
 """
 
+import asyncio
 import os
-import sys
+import time
+from types import SimpleNamespace
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
 
 os.environ.setdefault("PROXY_AUTH_TOKEN", "test-token")
 os.environ.setdefault("TURNSTILE_SECRET_KEY", "test-secret")
@@ -16,7 +20,10 @@ os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "FALSE")
 os.environ.setdefault("GOOGLE_API_KEY", "fake-key-for-test")
 
 from fastapi.testclient import TestClient
-from agent.agent_api import _build_search_prompt, app
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from agent import agent_api
+from agent.agent_api import _build_search_prompt, app, search_places_batch
 
 
 client = TestClient(app, raise_server_exceptions=False)
@@ -102,6 +109,30 @@ class TestRequestValidation:
         )
         assert resp.status_code == 422
 
+    def test_blank_city_returns_422(self):
+        resp = client.post(
+            "/search",
+            json={"city": "   ", "preferences": "ramen", "turnstile_token": "tok"},
+            headers={"X-Proxy-Auth": "test-token"},
+        )
+        assert resp.status_code == 422
+
+    def test_oversized_preferences_returns_422(self):
+        resp = client.post(
+            "/search",
+            json={
+                "city": "Tokyo",
+                "preferences": "r" * (agent_api.MAX_PREFERENCES_LENGTH + 1),
+                "turnstile_token": "tok",
+            },
+            headers={"X-Proxy-Auth": "test-token"},
+        )
+        assert resp.status_code == 422
+
+    def test_search_places_rejects_blank_input(self):
+        with pytest.raises(ValueError):
+            asyncio.run(agent_api.search_places("Tokyo", "  "))
+
     def test_topic_is_optional(self):
         """topic field should be optional (defaults to None)."""
         resp = client.post(
@@ -151,3 +182,352 @@ class TestBuildSearchPrompt:
             result = _build_search_prompt("Oslo", "fjords", past)
             assert "Oslo" in result
             assert "fjords" in result
+
+
+# ============================================================================
+# search_places_batch
+# ============================================================================
+
+
+class TestSearchPlacesBatch:
+    def test_results_keep_query_order(self, monkeypatch):
+        async def fake_search(city_name, preferences, topic=None):
+            # Finish in reverse order to prove results are not completion-ordered
+            await asyncio.sleep(0.01 * (3 - int(city_name)))
+            return f"{city_name}:{preferences}"
+
+        monkeypatch.setattr(agent_api, "search_places", fake_search)
+        queries = [{"city_name": str(i), "preferences": "p"} for i in range(3)]
+        assert asyncio.run(search_places_batch(queries)) == ["0:p", "1:p", "2:p"]
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        running = 0
+        peak = 0
+
+        async def fake_search(city_name, preferences, topic=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return city_name
+
+        monkeypatch.setattr(agent_api, "search_places", fake_search)
+        queries = [{"city_name": str(i), "preferences": "p"} for i in range(6)]
+        asyncio.run(search_places_batch(queries, max_concurrency=2))
+        assert peak == 2
+
+    def test_failure_cancels_sibling_searches(self, monkeypatch):
+        cancelled = []
+
+        async def fake_search(city_name, preferences, topic=None):
+            if city_name == "bad":
+                raise ValueError("city_name and preferences must be non-empty")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(city_name)
+                raise
+            return city_name
+
+        monkeypatch.setattr(agent_api, "search_places", fake_search)
+        queries = [
+            {"city_name": name, "preferences": "p"} for name in ("a", "bad", "b")
+        ]
+
+        async def scenario():
+            with pytest.raises(ValueError):
+                await search_places_batch(queries)
+            # Already cancelled when the error surfaces, not at loop shutdown
+            return sorted(cancelled)
+
+        assert asyncio.run(scenario()) == ["a", "b"]
+
+
+# ============================================================================
+# _invoke_llm_pipeline model fallback and hedging
+# ============================================================================
+
+_OVERLOADED = "503 UNAVAILABLE. The model is overloaded."
+_QUOTA = "429 RESOURCE_EXHAUSTED: quota exceeded"
+
+
+async def _ok():
+    return "fallback result"
+
+
+class TestModelFallback:
+    @pytest.fixture(autouse=True)
+    def _fake_models(self, monkeypatch):
+        # Each model's pipeline run is replaced by a coroutine from
+        # self.behaviours; self.started records which models actually ran.
+        self.behaviours = {}
+        self.started = []
+        self.session_service = InMemorySessionService()
+
+        async def fake_run(runner, user_id, session_id, query_content, **kwargs):
+            self.started.append(runner)
+            return await self.behaviours[runner]()
+
+        monkeypatch.setattr(agent_api, "_get_runner", lambda model_name, *_: model_name)
+        monkeypatch.setattr(
+            agent_api.places_agent_core, "run_runner_collect_final_text", fake_run
+        )
+        monkeypatch.setattr(
+            agent_api.places_agent_core,
+            "initialize_services",
+            lambda: (self.session_service, None),
+        )
+        monkeypatch.setattr(agent_api, "_HEDGE_DELAY_S", None)
+
+    def _invoke(self):
+        return asyncio.run(
+            agent_api._invoke_llm_pipeline("prompt", "u", ("primary", "fallback"))
+        )
+
+    def _remaining_sessions(self):
+        return asyncio.run(
+            self.session_service.list_sessions(app_name="PlacesSearchApp", user_id="u")
+        ).sessions
+
+    def test_transient_error_falls_back(self):
+        async def overloaded():
+            raise RuntimeError(_OVERLOADED)
+
+        self.behaviours = {"primary": overloaded, "fallback": _ok}
+        assert self._invoke() == "fallback result"
+        assert self.started == ["primary", "fallback"]
+        assert self._remaining_sessions() == []
+
+    def test_quota_error_falls_back(self):
+        async def exhausted():
+            raise RuntimeError(_QUOTA)
+
+        self.behaviours = {"primary": exhausted, "fallback": _ok}
+        assert self._invoke() == "fallback result"
+
+    def test_all_models_exhausted_returns_quota_message(self):
+        async def exhausted():
+            raise RuntimeError(_QUOTA)
+
+        self.behaviours = {"primary": exhausted, "fallback": exhausted}
+        assert self._invoke() == agent_api._QUOTA_EXCEEDED_MESSAGE
+
+    def test_non_transient_error_propagates_without_fallback(self):
+        async def invalid():
+            raise ValueError("400 INVALID_ARGUMENT")
+
+        self.behaviours = {"primary": invalid, "fallback": _ok}
+        with pytest.raises(ValueError):
+            self._invoke()
+        assert self.started == ["primary"]
+        assert self._remaining_sessions() == []
+
+    def test_hedge_cancels_slow_primary_and_deletes_its_session(self, monkeypatch):
+        monkeypatch.setattr(agent_api, "_HEDGE_DELAY_S", 0.01)
+        primary_cancelled = False
+
+        async def slow():
+            nonlocal primary_cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled = True
+                raise
+
+        self.behaviours = {"primary": slow, "fallback": _ok}
+        assert self._invoke() == "fallback result"
+        assert self.started == ["primary", "fallback"]
+        assert primary_cancelled
+        assert self._remaining_sessions() == []
+
+    def test_failure_after_hedge_wakes_the_waiting_candidate(self, monkeypatch):
+        monkeypatch.setattr(agent_api, "_HEDGE_DELAY_S", 0.5)
+        secondary_cancelled = False
+
+        async def overloaded_after_hedge():
+            while "secondary" not in self.started:
+                await asyncio.sleep(0.01)
+            raise RuntimeError(_OVERLOADED)
+
+        async def slow():
+            nonlocal secondary_cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                secondary_cancelled = True
+                raise
+
+        async def third():
+            return "third result"
+
+        self.behaviours = {
+            "primary": overloaded_after_hedge,
+            "secondary": slow,
+            "third": third,
+        }
+        started_at = time.monotonic()
+        result = asyncio.run(
+            agent_api._invoke_llm_pipeline(
+                "prompt", "u", ("primary", "secondary", "third")
+            )
+        )
+        # The third model starts on the primary's failure, not on its own
+        # hedge timeout at twice the delay.
+        assert time.monotonic() - started_at < 0.9
+        assert result == "third result"
+        assert self.started == ["primary", "secondary", "third"]
+        assert secondary_cancelled
+        assert self._remaining_sessions() == []
+
+    def test_success_wins_over_failure_finishing_together(self, monkeypatch):
+        monkeypatch.setattr(agent_api, "_HEDGE_DELAY_S", 0.01)
+        gate = asyncio.Event()
+
+        async def both_started():
+            # Release both attempts at once, so they complete in one batch.
+            if len(self.started) == 2:
+                gate.set()
+            await gate.wait()
+
+        async def invalid():
+            await both_started()
+            raise ValueError("400 INVALID_ARGUMENT")
+
+        async def ok():
+            await both_started()
+            return "fallback result"
+
+        self.behaviours = {"primary": invalid, "fallback": ok}
+        assert self._invoke() == "fallback result"
+
+
+# ============================================================================
+# _invoke_llm_pipeline_coalesced
+# ============================================================================
+
+
+class TestPromptCoalescing:
+    @pytest.fixture(autouse=True)
+    def _fake_pipeline(self, monkeypatch):
+        self.calls = 0
+        self.error = None
+
+        async def fake_pipeline(prompt, user_id, model_candidates):
+            self.calls += 1
+            await self.release.wait()
+            if self.error is not None:
+                raise self.error
+            return f"result for {prompt}"
+
+        monkeypatch.setattr(agent_api, "_INFLIGHT", {})
+        monkeypatch.setattr(agent_api, "_invoke_llm_pipeline", fake_pipeline)
+
+    def _callers(self, count):
+        return [
+            asyncio.create_task(
+                agent_api._invoke_llm_pipeline_coalesced("p", "u", ("m",))
+            )
+            for _ in range(count)
+        ]
+
+    def test_identical_prompts_share_one_run(self):
+        async def scenario():
+            self.release = asyncio.Event()
+            callers = self._callers(2)
+            await asyncio.sleep(0)
+            self.release.set()
+            return await asyncio.gather(*callers)
+
+        assert asyncio.run(scenario()) == ["result for p", "result for p"]
+        assert self.calls == 1
+        assert agent_api._INFLIGHT == {}
+
+    def test_cancelled_caller_does_not_cancel_the_shared_run(self):
+        async def scenario():
+            self.release = asyncio.Event()
+            leaving, staying = self._callers(2)
+            await asyncio.sleep(0)
+            leaving.cancel()
+            await asyncio.sleep(0)
+            self.release.set()
+            return await staying, leaving.cancelled()
+
+        assert asyncio.run(scenario()) == ("result for p", True)
+        assert self.calls == 1
+
+    def test_failed_run_is_forgotten(self):
+        self.error = RuntimeError("pipeline exploded")
+
+        async def scenario():
+            self.release = asyncio.Event()
+            callers = self._callers(2)
+            await asyncio.sleep(0)
+            self.release.set()
+            return await asyncio.gather(*callers, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(r is self.error for r in results)
+        assert self.calls == 1
+        assert agent_api._INFLIGHT == {}
+
+
+# ============================================================================
+# Degraded flag on /search
+# ============================================================================
+
+
+class TestDegradedFlag:
+    def _search(self, monkeypatch, result):
+        async def fake_search(city_name, preferences, topic=None, user_id=None):
+            return result
+
+        async def accept(token):
+            return None
+
+        monkeypatch.setattr(agent_api, "search_places", fake_search)
+        monkeypatch.setattr(agent_api, "_verify_turnstile", accept)
+        resp = client.post(
+            "/search",
+            json={"city": "Oslo", "preferences": "fjords", "turnstile_token": "tok"},
+            headers={"X-Proxy-Auth": "test-token"},
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    def test_normal_result_is_not_degraded(self, monkeypatch):
+        data = self._search(monkeypatch, "1. Fjord cruise")
+        assert data == {"result": "1. Fjord cruise", "degraded": False}
+
+    def test_overload_fallback_is_degraded(self, monkeypatch):
+        data = self._search(monkeypatch, agent_api._MODEL_OVERLOADED_MESSAGE)
+        assert data["degraded"] is True
+
+
+# ============================================================================
+# ADK logging plugin
+# ============================================================================
+
+
+class TestLoggingPlugin:
+    def test_callbacks_log_instead_of_printing(self, caplog, capsys):
+        # Driven through a public callback, so an ADK release that stops
+        # routing through the overridden _log shows up as stdout output.
+        context = SimpleNamespace(
+            invocation_id="inv-1",
+            session=SimpleNamespace(id="s1"),
+            user_id="u",
+            app_name="PlacesSearchApp",
+            agent=None,
+            branch=None,
+        )
+        message = types.Content(role="user", parts=[types.Part(text="ramen")])
+        with caplog.at_level("INFO", logger="agent.agent_api.adk"):
+            asyncio.run(
+                agent_api._LOGGING_PLUGIN.on_user_message_callback(
+                    invocation_context=context, user_message=message
+                )
+            )
+        assert "USER MESSAGE RECEIVED" in caplog.text
+        assert "inv-1" in caplog.text
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,222 @@
+"""
+Unit tests for the shared places pipeline core.
+
+Tests session handling and model error classification in
+agent/utils/places_agent_core.py without calling Gemini.
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "fake-key-for-test")
+
+from google.adk.sessions import InMemorySessionService
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from agent.utils import places_agent_core
+
+# ============================================================================
+# create_or_retrieve_session
+# ============================================================================
+
+
+class TestCreateOrRetrieveSession:
+    def test_creates_missing_session(self):
+        service = InMemorySessionService()
+        session, created = asyncio.run(
+            places_agent_core.create_or_retrieve_session(service, "app", "u", "s1")
+        )
+        assert created and session.id == "s1"
+
+    def test_returns_existing_session(self):
+        service = InMemorySessionService()
+
+        async def scenario():
+            await service.create_session(app_name="app", user_id="u", session_id="s1")
+            return await places_agent_core.create_or_retrieve_session(
+                service, "app", "u", "s1"
+            )
+
+        session, created = asyncio.run(scenario())
+        assert not created and session.id == "s1"
+
+    def test_concurrent_creates_share_one_session(self):
+        service = InMemorySessionService()
+
+        async def scenario():
+            return await asyncio.gather(
+                *(
+                    places_agent_core.create_or_retrieve_session(
+                        service, "app", "u", "s1"
+                    )
+                    for _ in range(2)
+                )
+            )
+
+        results = asyncio.run(scenario())
+        assert sorted(created for _, created in results) == [False, True]
+        assert {session.id for session, _ in results} == {"s1"}
+
+    def test_fresh_session_is_created_without_lookup(self):
+        service = InMemorySessionService()
+
+        async def no_lookup(**kwargs):
+            raise AssertionError("a fresh session ID must not be looked up")
+
+        service.get_session = no_lookup
+        session, created = asyncio.run(
+            places_agent_core.create_or_retrieve_session(service, "app", "u")
+        )
+        assert created and session.id
+
+
+# ============================================================================
+# Model error classification
+# ============================================================================
+
+
+class TestModelErrorClassification:
+    def test_overloaded_503_is_transient(self):
+        exc = RuntimeError("503 UNAVAILABLE. The model is overloaded.")
+        assert places_agent_core.is_transient_model_error(exc)
+        assert not places_agent_core.is_quota_exhausted_error(exc)
+
+    def test_keyword_order_does_not_matter(self):
+        exc = RuntimeError("Service Unavailable\n(status 503)")
+        assert places_agent_core.is_transient_model_error(exc)
+
+    def test_quota_429_is_transient_and_quota(self):
+        exc = RuntimeError("429 RESOURCE_EXHAUSTED: quota exceeded")
+        assert places_agent_core.is_transient_model_error(exc)
+        assert places_agent_core.is_quota_exhausted_error(exc)
+
+    def test_genai_server_error_503_is_transient(self):
+        exc = genai_errors.ServerError(503, {"error": {"message": "Backend error"}})
+        assert places_agent_core.is_transient_model_error(exc)
+
+    def test_unrelated_errors_are_not_transient(self):
+        for msg in ("400 INVALID_ARGUMENT", "503", "quota", "overloaded parser"):
+            exc = ValueError(msg)
+            assert not places_agent_core.is_transient_model_error(exc)
+            assert not places_agent_core.is_quota_exhausted_error(exc)
+
+
+# ============================================================================
+# run_runner_collect_final_text
+# ============================================================================
+
+
+class _FakeEvent:
+    def __init__(self, author, text):
+        self.author = author
+        self.content = types.Content(role="model", parts=[types.Part(text=text)])
+
+    def is_final_response(self):
+        return True
+
+
+class _FakeRunner:
+    """Stands in for Runner; records which events were consumed and whether
+    the event stream was closed."""
+
+    def __init__(self, events):
+        self.events = events
+        self.yielded = []
+        self.closed = False
+
+    async def run_async(self, user_id, session_id, new_message):
+        try:
+            for event in self.events:
+                self.yielded.append(event.author)
+                yield event
+        finally:
+            self.closed = True
+
+
+def _collect(runner, max_attempts=1, final_author=None):
+    return asyncio.run(
+        places_agent_core.run_runner_collect_final_text(
+            runner=runner,
+            user_id="u",
+            session_id="s",
+            query_content=types.Content(role="user", parts=[types.Part(text="q")]),
+            max_attempts=max_attempts,
+            initial_delay_s=2.0,
+            backoff_factor=2.0,
+            final_author=final_author,
+        )
+    )
+
+
+class TestCollectFinalText:
+    def test_stops_at_final_author_and_closes_stream(self):
+        runner = _FakeRunner(
+            [
+                _FakeEvent("ResearchAgent", "raw findings"),
+                _FakeEvent(places_agent_core.FINAL_AGENT_NAME, "final guide"),
+                _FakeEvent("LateAgent", "never read"),
+            ]
+        )
+        text = _collect(runner, final_author=places_agent_core.FINAL_AGENT_NAME)
+        assert text == "final guide"
+        assert runner.yielded == ["ResearchAgent", places_agent_core.FINAL_AGENT_NAME]
+        assert runner.closed
+
+
+class _Overloaded(Exception):
+    """Transient 503 carrying an optional Retry-After header, like genai errors."""
+
+    def __init__(self, retry_after=None):
+        super().__init__("503 UNAVAILABLE. The model is overloaded.")
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class _FlakyRunner:
+    """Raises each queued error on successive runs, then answers."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+
+    async def run_async(self, user_id, session_id, new_message):
+        if self.errors:
+            raise self.errors.pop(0)
+        yield _FakeEvent(places_agent_core.FINAL_AGENT_NAME, "final guide")
+
+
+class TestRetryDelays:
+    @pytest.fixture(autouse=True)
+    def _record_sleeps(self, monkeypatch):
+        self.sleeps = []
+        self.jitter_bounds = []
+
+        async def fake_sleep(seconds):
+            self.sleeps.append(seconds)
+
+        def max_jitter(low, high):
+            self.jitter_bounds.append((low, high))
+            return high
+
+        monkeypatch.setattr(places_agent_core.asyncio, "sleep", fake_sleep)
+        monkeypatch.setattr(places_agent_core.random, "uniform", max_jitter)
+
+    def test_retry_after_header_is_used(self):
+        runner = _FlakyRunner(_Overloaded(retry_after="7"))
+        assert _collect(runner, max_attempts=3) == "final guide"
+        assert self.sleeps == [7.0]
+
+    def test_delay_is_capped(self):
+        runner = _FlakyRunner(_Overloaded(retry_after="3600"))
+        assert _collect(runner, max_attempts=3) == "final guide"
+        assert self.sleeps == [places_agent_core.MAX_RETRY_DELAY_S]
+
+    def test_backoff_jitter_stays_within_20_percent(self):
+        runner = _FlakyRunner(_Overloaded(), _Overloaded())
+        assert _collect(runner, max_attempts=3) == "final guide"
+        # Initial delay 2s doubling per attempt, at the top of the jitter range
+        assert self.sleeps == pytest.approx([2.4, 4.8])
+        assert self.jitter_bounds == [(1.0, 1.2), (1.0, 1.2)]
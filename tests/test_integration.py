@@ -13,20 +13,22 @@ spun up via testcontainers (shared across the session — see ``conftest.py``).
 """
 
 import os
-import sys
 import pytest
 import pytest_asyncio
 from unittest.mock import AsyncMock, patch
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 os.environ.setdefault("PROXY_AUTH_TOKEN", "test-token")
 os.environ.setdefault("TURNSTILE_SECRET_KEY", "test-secret")
 os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "FALSE")
 os.environ.setdefault("GOOGLE_API_KEY", "fake-key-for-test")
 
 from httpx import ASGITransport, AsyncClient
-from agent.agent_api import app, _verify_turnstile, _DEV_DUMMY_KEY, search_places
+from agent import agent_api
+from agent.agent_api import (
+    app,
+    _verify_turnstile,
+    search_places,
+)
 from agent.utils import topic_preferences as topic_prefs_module
 from agent.utils.topic_preferences import (
     _init_with_url,
@@ -274,7 +276,9 @@ class TestTurnstileVerification:
         hf_app_path = Path(__file__).parent.parent / "frontend" / "hf_app.py"
         source_code = hf_app_path.read_text()
 
-        match = re.search(r"httpx\.AsyncClient\(timeout=(\d+(?:\.\d+)?)\)", source_code)
+        match = re.search(
+            r"httpx\.AsyncClient\(timeout=(\d+(?:\.\d+)?)[,)]", source_code
+        )
         assert match is not None, (
             "Could not find httpx.AsyncClient(timeout=...) call in frontend/hf_app.py"
         )
@@ -356,7 +360,7 @@ async def pg_db_with_dummy_llm(postgres_asyncpg_url, monkeypatch):
     """Point topic_preferences at the shared Postgres container, truncate the
     table, and force the dev-dummy LLM path for the duration of the test."""
     monkeypatch.setenv("DATABASE_URL", postgres_asyncpg_url)
-    monkeypatch.setenv("GOOGLE_API_KEY", _DEV_DUMMY_KEY)
+    monkeypatch.setattr(agent_api, "_AUTH_MODE", "dummy")
 
     await _init_with_url(postgres_asyncpg_url)
     from sqlalchemy import text
@@ -12,14 +12,11 @@ Requires Docker for all classes except ``TestBuildDbUrl`` and
 """
 
 import os
-import sys
 from unittest.mock import AsyncMock, patch
 
 import pytest
 import pytest_asyncio
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 os.environ.setdefault("GOOGLE_API_KEY", "test-api-key-returns-dummy-response")
 os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "FALSE")
 
@@ -4,48 +4,41 @@ Unit tests for custom tools (Day 4b)
 Tests the scoring functions used in the FilterAgent.
 """
 
-import sys
-import os
+import pytest
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-from agent.utils.scoring_tools import calculate_distance_score, get_place_category_boost
+from agent.utils.scoring_tools import (
+    calculate_distance_score,
+    calculate_distance_scores_batch,
+    compute_final_scores,
+    get_place_category_boost,
+    get_place_category_boosts_batch,
+)
 
 
 class TestDistanceScoreCalculation:
     """Test suite for calculate_distance_score function"""
 
-    def test_very_close_distance(self):
-        """Test score for very close distance (<=1 km)"""
-        result = calculate_distance_score(0.5)
-        assert result["status"] == "success"
-        assert result["score"] == 10
-        assert result["distance_km"] == 0.5
-
-    def test_close_distance(self):
-        """Test score for close distance (<=3 km)"""
-        result = calculate_distance_score(2.5)
-        assert result["status"] == "success"
-        assert result["score"] == 8
-
-    def test_medium_distance(self):
-        """Test score for medium distance (<=5 km)"""
-        result = calculate_distance_score(4.5)
+    @pytest.mark.parametrize(
+        ("distance_km", "score"),
+        [
+            (0, 10),  # zero distance
+            (0.5, 10),  # very close (<=1 km)
+            (1.0, 10),  # band upper bounds are inclusive
+            (2.5, 8),  # close (<=3 km)
+            (3.0, 8),
+            (4.5, 6),  # medium (<=5 km)
+            (5.0, 6),
+            (8.0, 4),  # far (<=10 km)
+            (10.0, 4),
+            (15.0, 2),  # very far (>10 km)
+        ],
+    )
+    def test_distance_bands(self, distance_km, score):
+        """Test the score for each distance band"""
+        result = calculate_distance_score(distance_km)
         assert result["status"] == "success"
-        assert result["score"] == 6
-
-    def test_far_distance(self):
-        """Test score for far distance (<=10 km)"""
-        result = calculate_distance_score(8.0)
-        assert result["status"] == "success"
-        assert result["score"] == 4
-
-    def test_very_far_distance(self):
-        """Test score for very far distance (>10 km)"""
-        result = calculate_distance_score(15.0)
-        assert result["status"] == "success"
-        assert result["score"] == 2
+        assert result["score"] == score
+        assert result["distance_km"] == distance_km
 
     def test_negative_distance(self):
         """Test error handling for negative distance"""
@@ -54,68 +47,83 @@ class TestDistanceScoreCalculation:
         assert "error_message" in result
         assert "negative" in result["error_message"].lower()
 
-    def test_zero_distance(self):
-        """Test score for zero distance"""
-        result = calculate_distance_score(0)
-        assert result["status"] == "success"
-        assert result["score"] == 10
-
 
 class TestCategoryBoostCalculation:
     """Test suite for get_place_category_boost function"""
 
-    def test_direct_match(self):
-        """Test boost for direct category match"""
-        result = get_place_category_boost("restaurant", "restaurant")
+    @pytest.mark.parametrize(
+        ("category", "preferences", "boost", "reason"),
+        [
+            ("restaurant", "restaurant", 3, "Direct match"),
+            ("cafe", "coffee cafe bar", 3, "Direct match"),  # partial match
+            ("RESTAURANT", "restaurant", 3, "Direct match"),  # case-insensitive
+            ("restaurant", "food and dining", 2, "Food-related match"),
+            ("museum", "art and culture", 2, "Culture-related match"),
+            ("park", "outdoor activities", 2, "Outdoor-related match"),
+            ("shopping", "museums", 0, "No special match"),
+        ],
+    )
+    def test_category_boost(self, category, preferences, boost, reason):
+        """Test the boost and reason for each kind of category match"""
+        result = get_place_category_boost(category, preferences)
         assert result["status"] == "success"
-        assert result["boost"] == 3
-        assert result["reason"] == "Direct match"
+        assert result["boost"] == boost
+        assert result["reason"] == reason
 
-    def test_partial_match(self):
-        """Test boost for partial category match"""
-        result = get_place_category_boost("cafe", "coffee cafe bar")
-        assert result["status"] == "success"
-        assert result["boost"] == 3
-        assert result["reason"] == "Direct match"
 
-    def test_food_related_match(self):
-        """Test boost for food-related category match"""
-        result = get_place_category_boost("restaurant", "food and dining")
-        assert result["status"] == "success"
-        assert result["boost"] == 2
-        assert result["reason"] == "Food-related match"
+class TestBatchScoring:
+    """Test suite for the batched tool variants registered on the FilterAgent"""
 
-    def test_culture_related_match(self):
-        """Test boost for culture-related category match"""
-        result = get_place_category_boost("museum", "art and culture")
+    def test_distance_batch_matches_single_calls(self):
+        """Test batch results equal per-distance results, in input order"""
+        distances = [0.5, 4.5, 15.0, -1.0]
+        result = calculate_distance_scores_batch(distances)
         assert result["status"] == "success"
-        assert result["boost"] == 2
-        assert result["reason"] == "Culture-related match"
+        assert result["results"] == [calculate_distance_score(d) for d in distances]
 
-    def test_outdoor_related_match(self):
-        """Test boost for outdoor-related category match"""
-        result = get_place_category_boost("park", "outdoor activities")
+    def test_category_batch_matches_single_calls(self):
+        """Test batch results equal per-category results, in input order"""
+        categories = ["museum", "RESTAURANT", "shopping"]
+        result = get_place_category_boosts_batch(categories, "art and food")
         assert result["status"] == "success"
-        assert result["boost"] == 2
-        assert result["reason"] == "Outdoor-related match"
+        assert [r["boost"] for r in result["results"]] == [2, 2, 0]
+        assert result["results"] == [
+            get_place_category_boost(c, "art and food") for c in categories
+        ]
+
+    def test_empty_batches(self):
+        """Test empty inputs return an empty result list"""
+        assert calculate_distance_scores_batch([])["results"] == []
+        assert get_place_category_boosts_batch([], "museums")["results"] == []
+
 
-    def test_no_match(self):
-        """Test boost for no category match"""
-        result = get_place_category_boost("shopping", "museums")
+class TestFinalScoreComputation:
+    """Test suite for compute_final_scores function"""
+
+    def test_weighted_combination(self):
+        """Test category is rescaled to 0-10 and weighted above distance"""
+        result = compute_final_scores([3, 0], [10, 10])
         assert result["status"] == "success"
-        assert result["boost"] == 0
-        assert result["reason"] == "No special match"
+        assert result["scores"] == [10.0, 4.0]
 
-    def test_case_insensitive(self):
-        """Test that matching is case-insensitive"""
-        result = get_place_category_boost("RESTAURANT", "restaurant")
+    def test_unknown_distance_uses_category_only(self):
+        """Test a distance score of 0 rates on category alone"""
+        result = compute_final_scores([2, 3], [0, 0])
         assert result["status"] == "success"
-        assert result["boost"] == 3
-        assert result["reason"] == "Direct match"
+        assert result["scores"] == [6.7, 10.0]
+
+    def test_scores_are_clamped_to_scale(self):
+        """Test the weakest inputs still produce the minimum rating of 1"""
+        result = compute_final_scores([0], [0])
+        assert result["scores"] == [1.0]
+
+    def test_length_mismatch(self):
+        """Test error handling when the input lists differ in length"""
+        result = compute_final_scores([1, 2], [8])
+        assert result["status"] == "error"
+        assert "same length" in result["error_message"]
 
 
 if __name__ == "__main__":
     # Run tests with pytest
-    import pytest
-
     pytest.main([__file__, "-v"])